@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     port: Optional[int] = None  # Railway sets this automatically
     api_key_placeholder: str = "your-api-key-here"
     log_level: str = "INFO"
+    debug_endpoints_enabled: bool = False  # Register diagnostic-only routes (e.g. /api/brochure/session-debug)
     anthropic_api_key: Optional[str] = None
     ideal_postcodes_api_key: Optional[str] = None
 
@@ -9,20 +9,30 @@ print("=== MAIN.PY LOADING ===", flush=True)
 print(f"Python: {sys.version}", flush=True)
 print(f"Executable: {sys.executable}", flush=True)
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, RedirectResponse, Response, ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import List, Optional, Dict
+from starlette.datastructures import FormData
+from pydantic import ValidationError as PydanticValidationError
+from typing import Any, List, Optional, Dict, Set, Tuple
 import logging
 import asyncio
 import os
+import re
 import time
 import uuid
 import json
+import orjson
 import base64
+import binascii
+import heapq
+import random
 import secrets
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
 from backend.config import settings
@@ -72,7 +82,6 @@ from backend.schemas import (
     # Quick social post schemas
     QuickSocialPostRequest,
     QuickSocialPostResponse,
-    SocialPostVariant,
     # Background removal schemas
     BackgroundRemovalRequest,
     BackgroundRemovalResponse,
@@ -97,6 +106,7 @@ from services.gp_service import GPService, get_gp_service
 from services.compliance_checker import ComplianceChecker
 from services.keyword_coverage import KeywordCoverage
 from services.length_policy import LengthPolicy
+from services.guardrails import get_base_guardrails, get_room_specific_additions
 from services.export_service import ExportService
 from services.rate_limiter import GlobalRateLimiter
 from services.marketing_generator import MarketingGenerator
@@ -127,7 +137,8 @@ logger = logging.getLogger(__name__)
 fastapi_app = FastAPI(
     title="Property Listing Generator",
     description="AI-powered property listing copy generation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -224,6 +235,12 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ Failed to start post scheduler: {e}")
 
+    # Start periodic cleanup of expired brochure sessions
+    global _session_cleanup_task
+    if brochure_session_service:
+        _session_cleanup_task = asyncio.create_task(_brochure_session_cleanup_loop())
+        logger.info("✅ Brochure session cleanup task started")
+
 
 @fastapi_app.on_event("shutdown")
 async def shutdown_event():
@@ -237,6 +254,17 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"❌ Failed to stop post scheduler: {e}")
 
+    # Stop the brochure session cleanup task
+    if _session_cleanup_task is not None:
+        _session_cleanup_task.cancel()
+
+    # Close the hashtag service's HTTP client
+    if hashtag_service:
+        await hashtag_service.close()
+
+    # Close the vision provider's API connections
+    await vision_adapter.close()
+
 # Disable caching for development
 @fastapi_app.middleware("http")
 async def disable_cache(request, call_next):
@@ -486,6 +514,28 @@ except Exception as e:
     logger.warning(f"Failed to initialize brochure session service: {e}")
     brochure_session_service = None
 
+# Initialize hashtag service (curated database is loaded once, at import)
+try:
+    hashtag_service = get_hashtag_service()
+    logger.info("Hashtag service initialized")
+except Exception as e:
+    logger.warning(f"Failed to initialize hashtag service: {e}")
+    hashtag_service = None
+
+# Expired brochure sessions are removed on this interval (see startup_event)
+BROCHURE_SESSION_CLEANUP_INTERVAL_SECONDS = 3600
+_session_cleanup_task: Optional[asyncio.Task] = None
+
+
+async def _brochure_session_cleanup_loop():
+    """Delete expired brochure sessions every BROCHURE_SESSION_CLEANUP_INTERVAL_SECONDS."""
+    while True:
+        await asyncio.sleep(BROCHURE_SESSION_CLEANUP_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(brochure_session_service.cleanup_expired)
+        except Exception as e:
+            logger.warning(f"⚠️ Scheduled brochure session cleanup failed: {e}")
+
 
 # Register admin routes for database management
 from backend.admin_routes import router as admin_router
@@ -698,9 +748,6 @@ async def generate_room_description(request: dict):
 
         logger.info(f"Room description request: {prompt[:100]}...")
 
-        # Import shared guardrails
-        from services.guardrails import get_base_guardrails, get_room_specific_additions
-
         # Build full prompt with enhanced guardrails
         base_guardrails = get_base_guardrails(target_words)
         room_additions = get_room_specific_additions()
@@ -1211,24 +1258,16 @@ async def analyze_images(files: List[UploadFile] = File(...)):
         raise HTTPException(status_code=422, detail="No files provided")
     
     try:
-        results = []
-        for file in files:
-            # Read file content
-            content = await file.read()
+        images = [(await file.read(), file.filename) for file in files]
 
-            try:
-                # Analyze image (rate limiting handled by GlobalRateLimiter in vision client)
-                analysis = await vision_adapter.analyze_image(
-                    image_data=content,
-                    filename=file.filename
-                )
-                results.append(analysis)
-            except ValidationError as e:
-                # Return validation error for specific file
-                logger.warning(f"Validation failed for {file.filename}: {str(e)}")
-                raise HTTPException(status_code=400, detail=f"{file.filename}: {str(e)}")
-
-        return results
+        try:
+            # Analyze all images together so batching providers can share requests
+            # (rate limiting handled by GlobalRateLimiter in vision client)
+            return await vision_adapter.analyze_images(images)
+        except ValidationError as e:
+            # Validation error message names the offending file
+            logger.warning(f"Validation failed: {str(e)}")
+            raise HTTPException(status_code=400, detail=str(e))
         
     except HTTPException:
         raise
@@ -1546,7 +1585,6 @@ Provide ONLY the rewritten text, no explanations or meta-commentary."""
                 f"This {property_type} offers {original_text[:100]}...",
                 f"Featuring {original_text[:100]}..."
             ]
-            import random
             regenerated_text = random.choice(mock_variants)
         else:
             # Call Claude
@@ -1593,10 +1631,6 @@ async def export_brochure_pdf(request: dict):
 
         # Import brochure PDF generator
         from services.brochure_pdf_generator import BrochurePDFGenerator
-        import base64
-        import tempfile
-        import uuid
-        from pathlib import Path
 
         # Create temp directory for this brochure
         temp_dir = Path(tempfile.gettempdir()) / f"brochure_{uuid.uuid4().hex}"
@@ -1769,8 +1803,6 @@ async def export_brochure_pdf(request: dict):
         logger.info(f"PDF generated: {pdf_path}")
 
         # Return PDF as file response
-        from fastapi.responses import FileResponse
-
         return FileResponse(
             path=str(pdf_path),
             media_type="application/pdf",
@@ -2822,9 +2854,12 @@ async def get_office_statistics(office_id: str):
 # PHOTOGRAPHER PORTAL: Photo Upload and Assignment
 # ============================================================================
 
-from fastapi import Form
-import os
-from datetime import datetime
+# Path separators are stripped from client-supplied photo filenames
+_PATH_SEPARATOR_RE = re.compile(r'[\\/]+')
+
+# Resolved once at import; upload dirs already created this process are remembered
+BASE_UPLOAD_DIR = Path(os.path.abspath("uploads"))
+_ensured_dirs: Set[str] = set()
 
 @fastapi_app.post("/photographer/upload")
 async def upload_photographer_photos(
@@ -2862,24 +2897,26 @@ async def upload_photographer_photos(
         # Remove any trailing/leading dots or spaces (Windows doesn't like these)
         safe_property_name = safe_property_name.strip('. ')
         # Replace multiple spaces with single space
-        import re
         safe_property_name = re.sub(r'\s+', ' ', safe_property_name)
 
         logger.info(f"📸 Photographer upload: {safe_property_name} ({len(photos)} photos) → {agent_email}")
 
-        # Create upload directory using absolute path construction
-        base_dir = os.path.abspath("uploads")
-        upload_dir = os.path.join(base_dir, office_id, safe_property_name)
+        # Create upload directory (only the first upload per property hits the filesystem)
+        office_dir = BASE_UPLOAD_DIR / office_id / safe_property_name
+        upload_dir = str(office_dir)
 
-        logger.info(f"Creating directory: {upload_dir}")
-        os.makedirs(upload_dir, exist_ok=True)
+        if upload_dir not in _ensured_dirs:
+            logger.info(f"Creating directory: {upload_dir}")
+            office_dir.mkdir(parents=True, exist_ok=True)
+            _ensured_dirs.add(upload_dir)
 
-        # Save photos
+        # Save photos (one timestamp per batch, indexed so names never collide)
+        batch_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         photo_paths = []
-        for photo in photos:
+        for i, photo in enumerate(photos):
             # Generate safe filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_filename = f"{timestamp}_{photo.filename}"
+            original_name = _PATH_SEPARATOR_RE.sub('_', photo.filename or "photo.jpg")
+            safe_filename = f"{batch_ts}_{i:03d}_{original_name}"
             photo_path = os.path.join(upload_dir, safe_filename)
 
             logger.info(f"Saving to: {photo_path}")
@@ -2921,15 +2958,19 @@ async def upload_photographer_photos(
 
 
 @fastapi_app.get("/photographer/uploads")
-async def get_photographer_upload_history(photographer_email: str):
+async def get_photographer_upload_history(
+    photographer_email: str,
+    limit: int = Query(50, ge=1, le=500)
+):
     """
     Get upload history for a photographer.
 
     Args:
         photographer_email: Email of photographer
+        limit: Maximum number of uploads to return (most recent first)
 
     Returns:
-        List of uploads by this photographer
+        List of uploads by this photographer, plus the total number they have made
     """
     try:
         logger.info(f"Fetching upload history for {photographer_email}")
@@ -2939,28 +2980,32 @@ async def get_photographer_upload_history(photographer_email: str):
         # TODO: Make this work across all offices the photographer has access to
 
         data = auth_system_instance._load_data()
-        all_uploads = []
-
-        for office_id, uploads in data.get("photographer_uploads", {}).items():
-            for upload in uploads:
-                if upload.get("uploaded_by") == photographer_email:
-                    all_uploads.append({
-                        "upload_id": upload.get("upload_id"),
-                        "property_name": upload.get("property_name"),
-                        "agent_email": upload.get("agent_email"),
-                        "photo_count": upload.get("photo_count"),
-                        "uploaded_at": upload.get("uploaded_at"),
-                        "status": upload.get("status"),
-                        "office_id": office_id
-                    })
-
-        # Sort by upload date (most recent first)
-        all_uploads.sort(key=lambda x: x.get("uploaded_at", ""), reverse=True)
+
+        matching_uploads = [
+            {
+                "upload_id": upload.get("upload_id"),
+                "property_name": upload.get("property_name"),
+                "agent_email": upload.get("agent_email"),
+                "photo_count": upload.get("photo_count"),
+                "uploaded_at": upload.get("uploaded_at"),
+                "status": upload.get("status"),
+                "office_id": office_id
+            }
+            for office_id, uploads in data.get("photographer_uploads", {}).items()
+            for upload in uploads
+            if upload.get("uploaded_by") == photographer_email
+        ]
+
+        # Keep only the most recent uploads (O(N log K) instead of a full sort)
+        all_uploads = heapq.nlargest(
+            limit, matching_uploads, key=lambda x: x.get("uploaded_at") or ""
+        )
 
         return {
             "photographer_email": photographer_email,
             "uploads": all_uploads,
-            "count": len(all_uploads)
+            "count": len(all_uploads),
+            "total": len(matching_uploads)
         }
 
     except Exception as e:
@@ -2996,9 +3041,6 @@ async def submit_feedback(
         Confirmation message
     """
     try:
-        import json
-        from datetime import datetime
-
         # Prepare feedback data
         feedback_entry = {
             "experience_rating": experience_rating,
@@ -3120,23 +3162,51 @@ async def get_agency_colors(agency_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Resolved logo paths per agency (short TTL so branding edits are picked up)
+_logo_path_cache = CacheManager(max_size=256)
+LOGO_PATH_CACHE_TTL_SECONDS = 300
+
+
 @fastapi_app.get("/agencies/{agency_id}/logo")
-async def get_agency_logo(agency_id: str):
+async def get_agency_logo(agency_id: str, request: Request):
     """
     Get logo file for an agency.
+
+    Sends a weak ETag so browsers can revalidate with If-None-Match
+    and receive a bodiless 304 when the logo is unchanged.
     """
     try:
         if not template_service:
             raise HTTPException(status_code=503, detail="Template service not available")
 
-        logo_path = template_service.get_logo_path(agency_id)
-        if not logo_path or not logo_path.exists():
+        logo_path = _logo_path_cache.get(agency_id)
+        if logo_path is None:
+            logo_path = template_service.get_logo_path(agency_id)
+            if logo_path:
+                _logo_path_cache.set(agency_id, logo_path, ttl_seconds=LOGO_PATH_CACHE_TTL_SECONDS)
+
+        try:
+            stat = logo_path.stat() if logo_path else None
+        except FileNotFoundError:
+            stat = None
+        if stat is None:
             raise HTTPException(status_code=404, detail=f"Logo not found for agency '{agency_id}'")
 
+        etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=86400"
+        }
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
         return FileResponse(
             path=str(logo_path),
             media_type="image/png",
-            filename=logo_path.name
+            filename=logo_path.name,
+            headers=headers,
+            stat_result=stat
         )
     except HTTPException:
         raise
@@ -3200,6 +3270,22 @@ async def select_template_for_property(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_ALLOWED_LOGO_MIMES = frozenset({"image/png", "image/jpeg", "image/webp", "image/svg+xml"})
+
+
+def _has_image_magic(header: bytes, content_type: str) -> bool:
+    """Check the leading bytes of an upload match its declared image type."""
+    if content_type == "image/png":
+        return header.startswith(b"\x89PNG")
+    if content_type == "image/jpeg":
+        return header.startswith(b"\xff\xd8\xff")
+    if content_type == "image/webp":
+        return header[:4] == b"RIFF" and header[8:12] == b"WEBP"
+    if content_type == "image/svg+xml":
+        return header.lstrip().startswith(b"<")
+    return False
+
+
 @fastapi_app.post("/agencies/{agency_id}/upload-logo")
 async def upload_agency_logo(
     agency_id: str,
@@ -3212,9 +3298,14 @@ async def upload_agency_logo(
         if not template_service:
             raise HTTPException(status_code=503, detail="Template service not available")
 
-        # Validate file type
-        if not file.content_type or not file.content_type.startswith("image/"):
-            raise HTTPException(status_code=400, detail="File must be an image")
+        # Validate file type (declared MIME, then magic bytes before reading the body)
+        if file.content_type not in _ALLOWED_LOGO_MIMES:
+            raise HTTPException(status_code=400, detail="File must be a PNG, JPEG, WebP or SVG image")
+
+        header = await file.read(16)
+        if not _has_image_magic(header, file.content_type):
+            raise HTTPException(status_code=400, detail="File contents do not match image type")
+        await file.seek(0)
 
         # Read file data
         logo_data = await file.read()
@@ -3226,6 +3317,7 @@ async def upload_agency_logo(
             filename=file.filename or "logo.png"
         )
 
+        _logo_path_cache.delete(agency_id)
         logger.info(f"Logo uploaded for agency '{agency_id}': {logo_path}")
 
         return {
@@ -3322,7 +3414,7 @@ async def share_brochure(request: ShareBrochureRequest):
     """
     try:
         # Generate unique handoff ID
-        handoff_id = str(uuid.uuid4())
+        handoff_id = uuid.uuid4().hex
 
         # Create handoff notification
         handoff = {
@@ -3606,71 +3698,150 @@ async def get_location_intelligence(
 # BROCHURE EDITING SESSION ENDPOINTS
 # =============================================================================
 
-@fastapi_app.post("/api/brochure/session-debug")
 async def debug_brochure_session(request: Request):
-    """Debug endpoint to see raw payload before Pydantic validation."""
+    """
+    Debug endpoint to see raw payload before Pydantic validation.
+
+    Only registered when settings.debug_endpoints_enabled is set.
+    """
     try:
         body = await request.json()
-        logger.info(f"🔴 [DEBUG-SESSION] Raw payload keys: {list(body.keys())}")
-        logger.info(f"🔴 [DEBUG-SESSION] user_email: {body.get('user_email')}")
-        logger.info(f"🔴 [DEBUG-SESSION] property keys: {list(body.get('property', {}).keys())}")
-        logger.info(f"🔴 [DEBUG-SESSION] agent keys: {list(body.get('agent', {}).keys())}")
-        logger.info(f"🔴 [DEBUG-SESSION] photos count: {len(body.get('photos', []))}")
-        if body.get('photos'):
-            first_photo = body['photos'][0]
-            logger.info(f"🔴 [DEBUG-SESSION] First photo keys: {list(first_photo.keys())}")
-            logger.info(f"🔴 [DEBUG-SESSION] First photo id: {first_photo.get('id')}")
-            logger.info(f"🔴 [DEBUG-SESSION] First photo dataUrl length: {len(first_photo.get('dataUrl', ''))}")
-        logger.info(f"🔴 [DEBUG-SESSION] pages count: {len(body.get('pages', []))}")
-        if body.get('pages'):
-            first_page = body['pages'][0]
-            logger.info(f"🔴 [DEBUG-SESSION] First page keys: {list(first_page.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔴 [DEBUG-SESSION] Raw payload keys: %s", list(body.keys()))
+            logger.debug("🔴 [DEBUG-SESSION] user_email: %s", body.get('user_email'))
+            logger.debug("🔴 [DEBUG-SESSION] property keys: %s", list(body.get('property', {}).keys()))
+            logger.debug("🔴 [DEBUG-SESSION] agent keys: %s", list(body.get('agent', {}).keys()))
+            logger.debug("🔴 [DEBUG-SESSION] photos count: %d", len(body.get('photos', [])))
+            if body.get('photos'):
+                first_photo = body['photos'][0]
+                logger.debug("🔴 [DEBUG-SESSION] First photo keys: %s", list(first_photo.keys()))
+                logger.debug("🔴 [DEBUG-SESSION] First photo id: %s", first_photo.get('id'))
+            logger.debug("🔴 [DEBUG-SESSION] pages count: %d", len(body.get('pages', [])))
+            if body.get('pages'):
+                logger.debug("🔴 [DEBUG-SESSION] First page keys: %s", list(body['pages'][0].keys()))
 
         # Try manual Pydantic validation to see exact error
-        from pydantic import ValidationError
         try:
-            validated = BrochureSessionCreateRequest(**body)
-            logger.info(f"🔴 [DEBUG-SESSION] Pydantic validation PASSED!")
+            BrochureSessionCreateRequest.model_validate(body)
+            logger.debug("🔴 [DEBUG-SESSION] Pydantic validation PASSED!")
             return {"status": "validation_passed", "payload_keys": list(body.keys())}
-        except ValidationError as ve:
-            logger.error(f"🔴 [DEBUG-SESSION] Pydantic validation FAILED:")
+        except PydanticValidationError as ve:
+            logger.error("🔴 [DEBUG-SESSION] Pydantic validation FAILED:")
             for error in ve.errors():
-                logger.error(f"🔴   Field: {error['loc']}, Type: {error['type']}, Msg: {error['msg']}")
+                logger.error("🔴   Field: %s, Type: %s, Msg: %s", error['loc'], error['type'], error['msg'])
             return {"status": "validation_failed", "errors": ve.errors()}
 
     except Exception as e:
-        logger.error(f"🔴 [DEBUG-SESSION] Error: {str(e)}")
+        logger.error("🔴 [DEBUG-SESSION] Error: %s", e)
         import traceback
         traceback.print_exc()
         return {"error": str(e)}
 
-@fastapi_app.post("/api/brochure/session", response_model=BrochureSessionResponse)
-async def create_brochure_session(request: BrochureSessionCreateRequest):
+
+if settings.debug_endpoints_enabled:
+    fastapi_app.post("/api/brochure/session-debug")(debug_brochure_session)
+
+
+def _session_property_character(session_data: BrochureSessionData) -> str:
+    """Property character from session preferences, defaulting to 'modern'."""
+    preferences = session_data.preferences or {}
+    if 'character' in preferences:
+        return preferences['character']
+    if 'propertyCharacter' in preferences:
+        return preferences['propertyCharacter']
+    return 'modern'
+
+
+def _score_session_photos(session_data: BrochureSessionData, debug_enabled: bool) -> None:
+    """Set impact_score on each session photo for hero page selection (non-critical)."""
+    try:
+        scorer = get_photo_scorer()
+        property_character = _session_property_character(session_data)
+
+        # Score photos that have analysis data in one batch
+        analysed_photos = []
+        for photo in session_data.photos:
+            if photo.analysis:
+                analysed_photos.append(photo)
+            else:
+                # Default score for photos without analysis
+                photo.impact_score = 50.0
+
+        for photo, score in zip(analysed_photos, scorer.score_photos(analysed_photos, property_character)):
+            photo.impact_score = score
+        scored_count = len(analysed_photos)
+
+        logger.info("📊 Scored %d/%d photos for impact (character: %s)", scored_count, len(session_data.photos), property_character)
+
+        # Log top 5 scored photos
+        if debug_enabled and session_data.photos:
+            top_5 = heapq.nlargest(5, session_data.photos, key=lambda p: p.impact_score or 0)
+            logger.debug("🏆 Top 5 photos by impact score:")
+            for idx, photo in enumerate(top_5, 1):
+                room_type = photo.analysis.get('room_type', 'unknown') if photo.analysis else 'unknown'
+                logger.debug("  %d. %s (%s): %.1f", idx, photo.name, room_type, photo.impact_score)
+
+    except Exception as e:
+        logger.warning("Failed to score photos: %s. Continuing without scores.", e)
+        # Non-critical - continue even if scoring fails
+
+
+def _body_validation_error(error: PydanticValidationError, *loc_prefix: str) -> RequestValidationError:
+    """Validation error for a hand-parsed body, located like FastAPI's own 422s."""
+    return RequestValidationError(
+        [{**err, "loc": ("body", *loc_prefix, *err["loc"])} for err in error.errors()]
+    )
+
+
+# The JSON session route reads its body itself, so document it explicitly.
+# Nested models resolve to the shared component schemas (also used by
+# BrochureSessionData) instead of inline $defs.
+_BROCHURE_SESSION_CREATE_SCHEMA = BrochureSessionCreateRequest.model_json_schema(
+    ref_template="#/components/schemas/{model}"
+)
+_BROCHURE_SESSION_CREATE_SCHEMA.pop("$defs", None)
+
+
+@fastapi_app.post(
+    "/api/brochure/session",
+    response_model=BrochureSessionResponse,
+    response_class=ORJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _BROCHURE_SESSION_CREATE_SCHEMA}},
+            "required": True
+        }
+    }
+)
+async def create_brochure_session(http_request: Request):
     """
     Create new brochure editing session.
 
     Saves complete brochure state with photos to server storage.
     Photos are decoded from base64 and saved as files.
 
+    The body (a BrochureSessionCreateRequest) is parsed and validated in a
+    single pydantic-core pass, and the response is encoded with orjson.
+
     Returns session_id and photo URL mappings.
     """
     if not brochure_session_service:
         raise HTTPException(status_code=503, detail="Brochure session service not available")
 
     try:
-        logger.info(f"Creating brochure session for {request.user_email}")
-        logger.info(f"🔍 [BACKEND-RECEIVED] Photos with analysis: {[(p.name, bool(p.analysis)) for p in request.photos]}")
+        request = BrochureSessionCreateRequest.model_validate_json(await http_request.body())
+    except PydanticValidationError as e:
+        raise _body_validation_error(e)
 
-        # 🔥 FORENSIC: Show first photo BEFORE Pydantic
-        if request.photos:
-            first_photo = request.photos[0]
-            logger.info(f"🔥 [FORENSIC-RAW] First photo BEFORE Pydantic:")
-            logger.info(f"    name: {first_photo.name}")
-            logger.info(f"    has analysis: {hasattr(first_photo, 'analysis')}")
-            logger.info(f"    analysis value: {first_photo.analysis if hasattr(first_photo, 'analysis') else 'NO ATTRIBUTE'}")
+    try:
+        logger.info("Creating brochure session for %s", request.user_email)
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("🔍 [BACKEND-RECEIVED] Photos with analysis: %s", [(p.name, bool(p.analysis)) for p in request.photos])
 
         # Convert request to session data
-        session_data = BrochureSessionData(
+        # Fields were validated as part of the request; skip a second pass
+        session_data = BrochureSessionData.model_construct(
             user_email=request.user_email,
             property=request.property,
             agent=request.agent,
@@ -3679,67 +3850,84 @@ async def create_brochure_session(request: BrochureSessionCreateRequest):
             preferences=request.preferences
         )
 
-        logger.info(f"🔍 [BACKEND-AFTER-PYDANTIC] Photos with analysis: {[(p.name, bool(p.analysis)) for p in session_data.photos]}")
-
-        # 🔥 FORENSIC: Show first photo AFTER Pydantic
-        if session_data.photos:
-            first_photo = session_data.photos[0]
-            logger.info(f"🔥 [FORENSIC-PYDANTIC] First photo AFTER Pydantic:")
-            logger.info(f"    name: {first_photo.name}")
-            logger.info(f"    has analysis: {hasattr(first_photo, 'analysis')}")
-            logger.info(f"    analysis value: {first_photo.analysis if hasattr(first_photo, 'analysis') else 'NO ATTRIBUTE'}")
+        if debug_enabled:
+            logger.debug("🔍 [BACKEND-AFTER-PYDANTIC] Photos with analysis: %s", [(p.name, bool(p.analysis)) for p in session_data.photos])
 
         # Score photos for hero page selection
-        try:
-            scorer = get_photo_scorer()
-
-            # Determine property character from preferences or default to 'modern'
-            property_character = 'modern'
-            if session_data.preferences:
-                # Try to extract character from preferences
-                if 'character' in session_data.preferences:
-                    property_character = session_data.preferences['character']
-                elif 'propertyCharacter' in session_data.preferences:
-                    property_character = session_data.preferences['propertyCharacter']
-
-            # Score each photo that has analysis data
-            scored_count = 0
-            for photo in session_data.photos:
-                if photo.analysis:
-                    photo.impact_score = scorer.score_photo(photo, property_character)
-                    scored_count += 1
-                else:
-                    # Default score for photos without analysis
-                    photo.impact_score = 50.0
-
-            logger.info(f"📊 Scored {scored_count}/{len(session_data.photos)} photos for impact (character: {property_character})")
-
-            # Log top 5 scored photos
-            if session_data.photos:
-                sorted_photos = sorted(session_data.photos, key=lambda p: p.impact_score or 0, reverse=True)
-                top_5 = sorted_photos[:5]
-                logger.info(f"🏆 Top 5 photos by impact score:")
-                for idx, photo in enumerate(top_5, 1):
-                    room_type = photo.analysis.get('room_type', 'unknown') if photo.analysis else 'unknown'
-                    logger.info(f"  {idx}. {photo.name} ({room_type}): {photo.impact_score:.1f}")
+        _score_session_photos(session_data, debug_enabled)
 
-        except Exception as e:
-            logger.warning(f"Failed to score photos: {e}. Continuing without scores.")
-            # Non-critical - continue even if scoring fails
+        # Create session (decodes and saves photos to disk off the event loop)
+        response = await asyncio.to_thread(brochure_session_service.create_session, session_data)
 
-        # Create session (saves photos to disk)
-        response = brochure_session_service.create_session(session_data)
+        logger.info("✅ Session created: %s", response.session_id)
 
-        logger.info(f"✅ Session created: {response.session_id}")
+        return ORJSONResponse(content=response.model_dump())
 
-        return response
+    except Exception as e:
+        logger.error(f"Failed to create brochure session: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
+
+
+@fastapi_app.post(
+    "/api/brochure/session/multipart",
+    response_model=BrochureSessionResponse,
+    response_class=ORJSONResponse
+)
+async def create_brochure_session_multipart(
+    metadata: str = Form(...),
+    photos: List[UploadFile] = File(default=[])
+):
+    """
+    Create new brochure editing session from a multipart upload.
+
+    Same as /api/brochure/session, but photos arrive as binary file parts
+    (each named after its photo ID) alongside a JSON `metadata` field holding
+    the BrochureSessionCreateRequest. This avoids base64's 33% overhead, and
+    photos are streamed to disk from the spooled uploads rather than decoded
+    from one large in-memory JSON body.
+
+    Returns session_id and photo URL mappings.
+    """
+    if not brochure_session_service:
+        raise HTTPException(status_code=503, detail="Brochure session service not available")
+
+    try:
+        request = BrochureSessionCreateRequest.model_validate_json(metadata)
+    except PydanticValidationError as e:
+        raise _body_validation_error(e, "metadata")
+
+    try:
+        logger.info("Creating brochure session (multipart) for %s with %d uploads", request.user_email, len(photos))
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        session_data = BrochureSessionData.model_construct(
+            user_email=request.user_email,
+            property=request.property,
+            agent=request.agent,
+            photos=request.photos,
+            pages=request.pages,
+            preferences=request.preferences
+        )
+
+        _score_session_photos(session_data, debug_enabled)
+
+        uploads = {upload.filename: (upload.file, upload.content_type) for upload in photos if upload.filename}
+        response = await asyncio.to_thread(brochure_session_service.create_session, session_data, uploads)
+
+        logger.info("✅ Session created: %s", response.session_id)
+
+        return ORJSONResponse(content=response.model_dump())
 
     except Exception as e:
         logger.error(f"Failed to create brochure session: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
 
-@fastapi_app.get("/api/brochure/session/{session_id}", response_model=BrochureSessionResponse)
+@fastapi_app.get(
+    "/api/brochure/session/{session_id}",
+    response_model=BrochureSessionResponse,
+    response_class=ORJSONResponse
+)
 async def load_brochure_session(session_id: str):
     """
     Load existing brochure editing session.
@@ -3760,12 +3948,13 @@ async def load_brochure_session(session_id: str):
 
         logger.info(f"✅ Session loaded: {session_id}")
 
-        return BrochureSessionResponse(
+        response = BrochureSessionResponse(
             session_id=session_id,
             expires_at=session_data.expires_at,
             photo_urls=photo_urls,
             data=session_data
         )
+        return ORJSONResponse(content=response.model_dump())
 
     except ValueError as e:
         logger.warning(f"Session not found or expired: {session_id}")
@@ -3775,7 +3964,7 @@ async def load_brochure_session(session_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to load session: {str(e)}")
 
 
-@fastapi_app.put("/api/brochure/session/{session_id}")
+@fastapi_app.put("/api/brochure/session/{session_id}", response_class=ORJSONResponse)
 async def update_brochure_session(session_id: str, data: BrochureSessionData):
     """
     Update existing brochure session (for auto-save).
@@ -3788,8 +3977,19 @@ async def update_brochure_session(session_id: str, data: BrochureSessionData):
     try:
         logger.info(f"Updating brochure session: {session_id}")
 
-        # Update session
-        brochure_session_service.update_session(session_id, data)
+        # Re-score every analysed photo so changed analyses or character
+        # preferences take effect; the scorer's memo makes unchanged photos free
+        analysed_photos = [p for p in data.photos if p.analysis]
+        if analysed_photos:
+            try:
+                scores = get_photo_scorer().score_photos(analysed_photos, _session_property_character(data))
+                for photo, score in zip(analysed_photos, scores):
+                    photo.impact_score = score
+            except Exception as e:
+                logger.warning("Failed to score photos: %s. Continuing without scores.", e)
+
+        # Update session (may decode and save new photos, so run off the event loop)
+        await asyncio.to_thread(brochure_session_service.update_session, session_id, data)
 
         logger.info(f"✅ Session updated: {session_id}")
 
@@ -3803,12 +4003,23 @@ async def update_brochure_session(session_id: str, data: BrochureSessionData):
         raise HTTPException(status_code=500, detail=f"Failed to update session: {str(e)}")
 
 
+_PHOTO_CONTENT_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif'
+}
+
+
 @fastapi_app.get("/api/brochure/session/{session_id}/photo/{photo_id}")
-async def serve_session_photo(session_id: str, photo_id: str):
+async def serve_session_photo(session_id: str, photo_id: str, request: Request):
     """
     Serve individual photo from a brochure session.
 
-    Returns the photo file with appropriate content-type.
+    Returns the photo file with appropriate content-type. A strong ETag built
+    from the file's mtime and size lets clients revalidate with If-None-Match
+    and get a bodiless 304 without the file being opened.
     """
     if not brochure_session_service:
         raise HTTPException(status_code=503, detail="Brochure session service not available")
@@ -3818,21 +4029,24 @@ async def serve_session_photo(session_id: str, photo_id: str):
         photo_path = brochure_session_service.get_photo_path(session_id, photo_id)
 
         # Determine content type from extension
-        extension = photo_path.suffix.lower()
-        content_type = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.webp': 'image/webp',
-            '.gif': 'image/gif'
-        }.get(extension, 'image/jpeg')
+        content_type = _PHOTO_CONTENT_TYPES.get(photo_path.suffix.lower(), 'image/jpeg')
+
+        # Stat once; FileResponse derives Content-Length and Last-Modified from it
+        stat = photo_path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=86400"  # Cache for 24 hours
+        }
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
 
         return FileResponse(
             path=photo_path,
             media_type=content_type,
-            headers={
-                "Cache-Control": "public, max-age=86400"  # Cache for 24 hours
-            }
+            headers=headers,
+            stat_result=stat
         )
 
     except FileNotFoundError as e:
@@ -3874,6 +4088,44 @@ async def cleanup_expired_sessions():
 # MARKETING CONTENT GENERATION ENDPOINTS
 # =============================================================================
 
+def _form_int(form: FormData, key: str) -> Optional[int]:
+    """Read an optional integer form field (empty/missing -> None)."""
+    value = form.get(key)
+    return int(value) if value else None
+
+
+def _form_json_list(form: FormData, key: str) -> Optional[list]:
+    """Read a JSON-encoded list form field, falling back to a single-item list."""
+    value = form.get(key)
+    if not value:
+        return None
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return [value]
+
+
+async def _parse_marketing_form(request: Request) -> Tuple[FormData, Dict[str, Any]]:
+    """
+    Parse the URLSearchParams form shared by the marketing endpoints.
+
+    Returns the raw form (for endpoint-specific fields) and the common
+    property fields, typed and ready to pass to the marketing generator.
+    """
+    form = await request.form()
+    fields = {
+        "property_name": form.get('property_name', 'Luxury Property'),
+        "address": form.get('address', 'Prime Location'),
+        "price": form.get('price'),
+        "bedrooms": _form_int(form, 'bedrooms'),
+        "bathrooms": _form_int(form, 'bathrooms'),
+        "property_type": form.get('property_type'),
+        "description": form.get('description'),
+        "key_features": _form_json_list(form, 'key_features'),
+    }
+    return form, fields
+
+
 @fastapi_app.post("/marketing/portal-listing")
 async def generate_portal_listing_endpoint(request: Request):
     """
@@ -3884,46 +4136,16 @@ async def generate_portal_listing_endpoint(request: Request):
         raise HTTPException(status_code=503, detail="Marketing generator not available")
 
     try:
-        # Parse form data manually
-        form_data = await request.form()
-        data = dict(form_data)
-
-        property_name = data.get('property_name', 'Luxury Property')
-        address = data.get('address', 'Prime Location')
-        portal = data.get('portal', 'rightmove')
-        price = data.get('price')
-        bedrooms = int(data.get('bedrooms')) if data.get('bedrooms') else None
-        bathrooms = int(data.get('bathrooms')) if data.get('bathrooms') else None
-        property_type = data.get('property_type')
-        description = data.get('description')
-
-        # Parse key_features JSON string if provided
-        features_list = None
-        key_features = data.get('key_features')
-        if key_features:
-            import json
-            try:
-                features_list = json.loads(key_features)
-            except:
-                features_list = [key_features]
+        form, fields = await _parse_marketing_form(request)
+        portal = form.get('portal', 'rightmove')
 
-        result = await marketing_generator.generate_portal_listing(
-            property_name=property_name,
-            address=address,
-            price=price,
-            bedrooms=bedrooms,
-            bathrooms=bathrooms,
-            property_type=property_type,
-            key_features=features_list,
-            description=description,
-            portal=portal
-        )
+        result = await marketing_generator.generate_portal_listing(**fields, portal=portal)
 
-        logger.info(f"Generated {portal} listing for {property_name}")
+        logger.info("Generated %s listing for %s", portal, fields['property_name'])
         return result
 
     except Exception as e:
-        logger.error(f"Failed to generate portal listing: {str(e)}")
+        logger.error("Failed to generate portal listing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -3937,55 +4159,28 @@ async def generate_email_newsletter_endpoint(request: Request):
         raise HTTPException(status_code=503, detail="Marketing generator not available")
 
     try:
-        # Parse form data manually
-        form_data = await request.form()
-        data = dict(form_data)
-
-        property_name = data.get('property_name', 'Luxury Property')
-        address = data.get('address', 'Prime Location')
-        price = data.get('price')
-        bedrooms = int(data.get('bedrooms')) if data.get('bedrooms') else None
-        bathrooms = int(data.get('bathrooms')) if data.get('bathrooms') else None
-        property_type = data.get('property_type')
-        description = data.get('description')
-        agent_name = data.get('agent_name')
-        agent_phone = data.get('agent_phone')
-        agent_email = data.get('agent_email')
-        hero_image_url = data.get('hero_image_url')
-
-        # Parse key_features JSON string if provided
-        features_list = None
-        key_features = data.get('key_features')
-        if key_features:
-            import json
-            try:
-                features_list = json.loads(key_features)
-            except:
-                features_list = [key_features]
+        form, fields = await _parse_marketing_form(request)
 
         result = await marketing_generator.generate_email_newsletter(
-            property_name=property_name,
-            address=address,
-            price=price,
-            bedrooms=bedrooms,
-            bathrooms=bathrooms,
-            property_type=property_type,
-            key_features=features_list,
-            description=description,
-            agent_name=agent_name,
-            agent_phone=agent_phone,
-            agent_email=agent_email,
-            hero_image_url=hero_image_url
+            **fields,
+            agent_name=form.get('agent_name'),
+            agent_phone=form.get('agent_phone'),
+            agent_email=form.get('agent_email'),
+            hero_image_url=form.get('hero_image_url')
         )
 
-        logger.info(f"Generated email newsletter for {property_name}")
+        logger.info("Generated email newsletter for %s", fields['property_name'])
         return result
 
     except Exception as e:
-        logger.error(f"Failed to generate email newsletter: {str(e)}")
+        logger.error("Failed to generate email newsletter: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Hashtags kept per social platform (Instagram and others: 15)
+_SOCIAL_HASHTAG_LIMITS = {"twitter": 3, "facebook": 5}
+
+
 @fastapi_app.post("/marketing/social-post")
 async def generate_social_post_endpoint(request: Request):
     """
@@ -3996,19 +4191,8 @@ async def generate_social_post_endpoint(request: Request):
         raise HTTPException(status_code=503, detail="Marketing generator not available")
 
     try:
-        # Parse form data manually
-        form_data = await request.form()
-        data = dict(form_data)
-
-        property_name = data.get('property_name', 'Luxury Property')
-        address = data.get('address', 'Prime Location')
-        platform = data.get('platform', 'facebook')
-        price = data.get('price')
-        bedrooms = int(data.get('bedrooms')) if data.get('bedrooms') else None
-        bathrooms = int(data.get('bathrooms')) if data.get('bathrooms') else None
-        property_type = data.get('property_type')
-        description = data.get('description')
-        image_url = data.get('image_url')
+        form, fields = await _parse_marketing_form(request)
+        platform = form.get('platform', 'facebook')
 
         # Validate platform
         valid_platforms = ["facebook", "twitter", "instagram"]
@@ -4018,57 +4202,38 @@ async def generate_social_post_endpoint(request: Request):
                 detail=f"Invalid platform. Must be one of: {', '.join(valid_platforms)}"
             )
 
-        # Parse key_features JSON string if provided
-        features_list = None
-        key_features = data.get('key_features')
-        if key_features:
-            import json
-            try:
-                features_list = json.loads(key_features)
-            except:
-                features_list = [key_features]
-
         result = await marketing_generator.generate_social_post(
-            property_name=property_name,
-            address=address,
-            price=price,
-            bedrooms=bedrooms,
-            bathrooms=bathrooms,
-            property_type=property_type,
-            key_features=features_list,
-            description=description,
+            **fields,
             platform=platform,
-            image_url=image_url
+            image_url=form.get('image_url')
         )
 
         # Enhance hashtags with curated database
         try:
-            hashtag_service = get_hashtag_service()
-            curated_hashtags = await hashtag_service.get_hashtags(
-                property_type=property_type,
-                location=address,
-                features=features_list,
+            # Only ask for as many curated tags as the platform will keep
+            hashtag_limit = _SOCIAL_HASHTAG_LIMITS.get(platform.lower(), 15)
+            curated_hashtags = hashtag_service.get_hashtags(
+                property_type=fields["property_type"],
+                location=fields["address"],
+                features=fields["key_features"],
                 platform=platform,
-                max_hashtags=15
+                max_hashtags=hashtag_limit
             )
 
             # Merge AI-generated and curated hashtags (AI first, then curated)
             ai_hashtags = result.get("hashtags", [])
             all_hashtags = ai_hashtags.copy()
 
-            # Add curated hashtags not already present
+            # Add curated hashtags not already present (case-insensitive)
+            seen = {t.lower() for t in all_hashtags}
             for tag in curated_hashtags.get("hashtags", []):
                 tag_lower = tag.lower()
-                if not any(t.lower() == tag_lower for t in all_hashtags):
+                if tag_lower not in seen:
+                    seen.add(tag_lower)
                     all_hashtags.append(tag)
 
             # Limit based on platform
-            if platform.lower() == "twitter":
-                all_hashtags = all_hashtags[:3]
-            elif platform.lower() == "facebook":
-                all_hashtags = all_hashtags[:5]
-            else:  # Instagram
-                all_hashtags = all_hashtags[:15]
+            all_hashtags = all_hashtags[:hashtag_limit]
 
             result["hashtags"] = all_hashtags
             result["hashtag_sources"] = {
@@ -4079,13 +4244,13 @@ async def generate_social_post_endpoint(request: Request):
             result["optimization_notes"] = curated_hashtags.get("optimization_notes", "")
 
         except Exception as e:
-            logger.warning(f"Failed to enhance hashtags: {e}")
+            logger.warning("Failed to enhance hashtags: %s", e)
 
-        logger.info(f"Generated {platform} post for {property_name}")
+        logger.info("Generated %s post for %s", platform, fields['property_name'])
         return result
 
     except Exception as e:
-        logger.error(f"Failed to generate social post: {str(e)}")
+        logger.error("Failed to generate social post: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -4097,32 +4262,21 @@ async def get_optimized_hashtags(request: Request):
     Returns curated, location-based, and property-specific hashtags
     from a database of proven high-engagement UK property hashtags.
     """
+    if not hashtag_service:
+        raise HTTPException(status_code=503, detail="Hashtag service not available")
+
     try:
-        form_data = await request.form()
-        data = dict(form_data)
-
-        property_type = data.get('property_type')
-        location = data.get('location') or data.get('address')
-        target_audience = data.get('target_audience')
-        features = data.get('features')
-        platform = data.get('platform', 'instagram')
-
-        # Parse features if JSON string
-        features_list = None
-        if features:
-            import json
-            try:
-                features_list = json.loads(features)
-            except:
-                features_list = [features]
+        form = await request.form()
+
+        property_type = form.get('property_type')
+        location = form.get('location') or form.get('address')
 
-        hashtag_service = get_hashtag_service()
-        result = await hashtag_service.get_hashtags(
+        result = hashtag_service.get_hashtags(
             property_type=property_type,
             location=location,
-            target_audience=target_audience,
-            features=features_list,
-            platform=platform,
+            target_audience=form.get('target_audience'),
+            features=_form_json_list(form, 'features'),
+            platform=form.get('platform', 'instagram'),
             max_hashtags=15
         )
 
@@ -4130,96 +4284,52 @@ async def get_optimized_hashtags(request: Request):
         trending = await hashtag_service.get_trending_hashtags()
         result["trending_hashtags"] = trending
 
-        logger.info(f"Generated {result['count']} hashtags for {property_type or 'property'} in {location or 'UK'}")
+        logger.info("Generated %s hashtags for %s in %s", result['count'], property_type or 'property', location or 'UK')
         return result
 
     except Exception as e:
-        logger.error(f"Failed to get hashtags: {str(e)}")
+        logger.error("Failed to get hashtags: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@fastapi_app.post("/api/quick-social-post", response_model=QuickSocialPostResponse)
-async def generate_quick_social_post(request: QuickSocialPostRequest):
-    """
-    Generate 3 social media caption variants for quick posting.
-    Lightweight endpoint optimized for speed - no full brochure generation.
-    """
-    if not claude_client or not claude_client.is_available():
-        raise HTTPException(status_code=503, detail="AI generation service not available")
+# Data URL MIME subtype -> extension the vision adapter validates against
+_QUICK_POST_PHOTO_EXTENSIONS = {"png": "png", "webp": "webp"}
 
-    try:
-        # Analyze images with vision if photos provided
-        image_descriptions = []
-        if request.photos and len(request.photos) > 0:
-            logger.info(f"Analyzing {len(request.photos)} photos for quick post")
-            for i, photo_data in enumerate(request.photos[:3]):  # Analyze up to 3 photos
-                try:
-                    # Extract base64 data from data URL
-                    if ',' in photo_data:
-                        photo_data = photo_data.split(',')[1]
-
-                    # Analyze with vision client
-                    image_analysis = await vision_adapter.analyze_image(
-                        image_data=photo_data,
-                        prompt="Describe this property photo in detail. Identify: room type, key features, style, condition, notable elements. Be specific and descriptive."
-                    )
 
-                    if image_analysis and 'description' in image_analysis:
-                        image_descriptions.append(f"Photo {i+1}: {image_analysis['description']}")
-                        logger.info(f"Photo {i+1} analyzed successfully")
-                except Exception as e:
-                    logger.warning(f"Failed to analyze photo {i+1}: {str(e)}")
-                    continue
-
-        # Build property details string
-        details = []
-        details.append(f"Address: {request.address}")
-        details.append(f"Price: {request.price}")
-        if request.bedrooms:
-            details.append(f"Bedrooms: {request.bedrooms}")
-        if request.bathrooms:
-            details.append(f"Bathrooms: {request.bathrooms}")
-        if request.highlights:
-            details.append(f"Highlights: {request.highlights}")
-
-        # Add image analysis if available
-        if image_descriptions:
-            details.append(f"\nProperty Images Analysis:")
-            details.extend(image_descriptions)
-
-        property_info = "\n".join(details)
+async def _analyze_quick_post_photo(photo_data: str, index: int) -> str:
+    """
+    Decode a quick post photo (data URL or bare base64) and describe it.
 
-        # Platform-specific character limits and style
-        platform_config = {
-            "instagram": {"limit": 2200, "style": "engaging with emojis, perfect for visual content"},
-            "facebook": {"limit": 400, "style": "conversational and community-focused"},
-            "linkedin": {"limit": 700, "style": "professional and business-oriented"},
-            "twitter": {"limit": 280, "style": "concise and impactful"}
-        }
+    The base64 payload is decoded once here and the raw bytes are handed to
+    the vision adapter, which validates and analyses bytes directly.
+    """
+    header, sep, payload = photo_data.partition(',')
+    if not sep:
+        header, payload = "", photo_data
+    image_bytes = binascii.a2b_base64(payload)
 
-        config = platform_config.get(request.platform.lower(), platform_config["facebook"])
+    subtype = header.partition('/')[2].partition(';')[0].lower()
+    extension = _QUICK_POST_PHOTO_EXTENSIONS.get(subtype, "jpg")
 
-        # Extract location components from address for hyper-localized hashtags
-        address_parts = request.address.split(',')
-        town_city = address_parts[0].strip() if len(address_parts) > 0 else ""
-        county = address_parts[-2].strip() if len(address_parts) > 2 else ""
+    analysis = await vision_adapter.analyze_image(
+        image_data=image_bytes,
+        filename=f"quick_post_{index}.{extension}"
+    )
+    if analysis.room_type:
+        return f"{analysis.room_type}: {analysis.suggested_caption}"
+    return analysis.suggested_caption
 
-        # Create prompt for 5 variants with hyper-localized hashtags
-        prompt = f"""You are a property marketing expert.
+# Static part of the quick social post prompt, sent as system instructions;
+# the per-property details follow in the user prompt.
+QUICK_POST_INSTRUCTIONS = """You are a property marketing expert.
 
 CRITICAL REQUIREMENT: You MUST create EXACTLY 5 COMPLETE caption variants. Not 3, not 4, but EXACTLY 5 variants.
 
-Property Details:
-{property_info}
-
-LOCATION CONTEXT (for hashtags):
-- Town/Area: {town_city}
-- County/Region: {county}
-- Use these EXACT location names in hashtags (e.g., #{town_city.replace(' ', '').replace('-', '')} #{county.replace(' ', '').replace('-', '')})
+The request gives the Property Details, the LOCATION CONTEXT (for hashtags), the platform and style, and the maximum characters per caption.
 
 Requirements:
-- Platform: {request.platform.upper()} ({config['style']})
-- Maximum {config['limit']} characters per caption
+- Write for the platform, in the style, given in the request
+- Keep each caption within the maximum characters given in the request
 - MANDATORY: Create ALL 5 caption variants with these EXACT styles (DO NOT skip variant4 or variant5):
 
 1. PREMIUM LIFESTYLE (variant1):
@@ -4258,19 +4368,19 @@ CRITICAL:
 - Each caption should be complete and post-ready
 - NO hashtags in the captions (we'll add those separately)
 - Highlight the price prominently in ALL variants
-- Stay within {config['limit']} characters
+- Stay within the maximum characters given in the request
 
 CRITICAL: Generate 8-12 HYPER-LOCALIZED, SPECIFIC hashtags:
 
 REQUIRED HASHTAG CATEGORIES (ALL hashtags MUST start with #):
-1. LOCATION (MANDATORY 2-3 tags) - Use the LOCATION CONTEXT provided above:
-   - MUST include: #{town_city.replace(' ', '').replace('-', '')} (exact town/area name)
-   - MUST include: #{county.replace(' ', '').replace('-', '')} or #{county.replace(' ', '').replace('-', '')}Properties
+1. LOCATION (MANDATORY 2-3 tags) - Use the LOCATION CONTEXT provided in the request:
+   - MUST include: the exact town/area name hashtag listed there
+   - MUST include: the county hashtag listed there (or its ...Properties form)
    - Optional: Nearby landmark if recognizable (e.g., #NearWinchesterCathedral)
 
 2. PROPERTY-SPECIFIC (2-3 tags) - From highlights:
    - Key features (#PoolVilla, #PanoramicViews, #ModernKitchen)
-   - Bedroom count (like #{request.bedrooms}Bedroom or #Studio)
+   - Bedroom count (like #3Bedroom or #Studio, using the bedrooms given in the request)
    - Special amenities (#GymAccess, #Parking, #Balcony)
 
 3. PROPERTY TYPE (1-2 tags):
@@ -4283,160 +4393,183 @@ REQUIRED HASHTAG CATEGORIES (ALL hashtags MUST start with #):
 5. HIGH-TRAFFIC (2-3 tags):
    - #DreamHome, #PropertyForSale, #RealEstate, #HomeSweetHome
 
-Return ONLY a JSON object with this EXACT structure:
-{{
-    "variant1": "caption text here",
-    "variant2": "caption text here",
-    "variant3": "caption text here",
-    "variant4": "caption text here",
-    "variant5": "caption text here",
-    "hashtags": ["#ExactNeighborhood", "#CityProperty", "#SpecificFeature", "#PropertyType", "#TargetAudience", "#DreamHome", "#RealEstate", "#Investment"]
-}}"""
-
-        # Generate with Claude (increased tokens for 5 variants)
-        response_text = await claude_client.generate_completion(
-            prompt=prompt,
-            temperature=0.8,
-            max_tokens=2500
-        )
+Return the 5 captions and the hashtags by calling the submit_captions tool."""
 
-        # Parse JSON response
-        import re
+# Per-request part of the quick social post prompt, filled with format_map
+QUICK_POST_PROMPT_TEMPLATE = """Property Details:
+{property_info}
 
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            json_text = json_match.group()
+LOCATION CONTEXT (for hashtags):
+- Town/Area: {town_city}
+- County/Region: {county}
+- Use these EXACT location names in hashtags (e.g., #{town_tag} #{county_tag})
+- Location hashtags to include: #{town_tag} and #{county_tag} or #{county_tag}Properties
 
-            # First try: parse as-is
-            try:
-                result = json.loads(json_text)
-            except json.JSONDecodeError as e:
-                logger.warning(f"Initial JSON parse failed: {e}. Attempting to fix unescaped newlines...")
-
-                # Second try: Fix unescaped newlines inside quoted strings
-                # This regex replaces actual newlines with \n only within string values
-                def fix_newlines_in_strings(match):
-                    """Replace literal newlines with \n escape sequences in JSON string values"""
-                    string_value = match.group(0)
-                    # Replace newlines with escaped version
-                    fixed = string_value.replace('\n', '\\n').replace('\r', '\\r')
-                    return fixed
-
-                # Match JSON string values - use DOTALL to match across newlines
-                # This pattern matches: "..." including escaped characters and literal newlines
-                pattern = r'"(?:[^"\\]|\\.|[\r\n])*?"'
-                json_text_fixed = re.sub(pattern, fix_newlines_in_strings, json_text, flags=re.DOTALL)
-
-                try:
-                    result = json.loads(json_text_fixed)
-                    logger.info("Successfully parsed JSON after fixing newlines")
-                except json.JSONDecodeError as e2:
-                    logger.error(f"Still failed after fix attempt: {e2}")
-                    logger.error(f"Fixed JSON text sample: {json_text_fixed[:500]}")
-                    raise
-        else:
-            raise ValueError("Could not parse JSON from response")
-
-        # Extract hashtags
-        hashtags = result.get("hashtags", [])
-        if not hashtags:
-            # Generate default hashtags if none provided
-            hashtags = ["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
-
-        # Create variant objects
-        variants = []
-        for i, key in enumerate(["variant1", "variant2", "variant3", "variant4", "variant5"], 1):
-            if key in result:
-                text = result[key].strip()
-                variants.append(SocialPostVariant(
-                    text=text,
-                    character_count=len(text),
-                    hashtags=hashtags
-                ))
-
-        if not variants:
-            raise ValueError("No variants generated")
-
-        # IMPORTANT: Ensure we ALWAYS return 5 variants by padding with variations
-        logger.info(f"📊 DEBUG: Before padding check - have {len(variants)} variants")
-        if len(variants) < 5:
-            logger.warning(f"⚠️ Only generated {len(variants)} variants instead of 5 - PADDING NOW!")
-            base_text = variants[0].text if variants else f"🏡 {request.address}\n💰 {request.price}\n{request.bedrooms}bed • {request.bathrooms}bath"
-
-            # Pad to 5 variants with simple variations
-            while len(variants) < 5:
-                variation_num = len(variants) + 1
-                logger.info(f"  → Adding variant #{variation_num}")
-                if variation_num == 2:
-                    # Bullet point style
-                    text = f"{request.address}\n\n• {request.bedrooms} Bedrooms\n• {request.bathrooms} Bathrooms\n• £{request.price}\n\nContact us to arrange a viewing!"
-                elif variation_num == 3:
-                    # Punchy style
-                    text = f"🏡 {request.bedrooms} bed property in {request.address.split(',')[0]}\n💰 £{request.price}\n✨ Ready to view!"
-                elif variation_num == 4:
-                    # Professional style
-                    text = f"Presenting: {request.bedrooms}-bedroom property at {request.address}. Priced at £{request.price}. {request.bathrooms} bathrooms. Contact for viewing."
-                elif variation_num == 5:
-                    # Story style
-                    text = f"Imagine coming home to {request.address}... {request.bedrooms} bedrooms, {request.bathrooms} bathrooms, yours for £{request.price}. Let's make it happen!"
-
-                variants.append(SocialPostVariant(
-                    text=text,
-                    character_count=len(text),
-                    hashtags=hashtags
-                ))
-
-        logger.info(f"✅ Final result: {len(variants)} caption variants with {len(hashtags)} hashtags for {request.platform}")
-
-        return QuickSocialPostResponse(
-            variants=variants,
-            hashtags=hashtags,
-            success=True
-        )
+Requirements:
+- Platform: {platform} ({style})
+- Maximum {limit} characters per caption
+- Bedrooms for the bedroom-count hashtag: {bedrooms}"""
+
+# Tool schema for the quick post captions: Claude fills it in directly, so the
+# response needs no JSON extraction/repair and always carries all 5 variants
+QUICK_POST_TOOL = "submit_captions"
+_QUICK_POST_VARIANT_KEYS = ("variant1", "variant2", "variant3", "variant4", "variant5")
+QUICK_POST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{key: {"type": "string", "description": "Complete, post-ready caption text"} for key in _QUICK_POST_VARIANT_KEYS},
+        "hashtags": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "8-12 hashtags, each starting with #"
+        }
+    },
+    "required": [*_QUICK_POST_VARIANT_KEYS, "hashtags"]
+}
+
+
+def _quick_post_variant(text: str, hashtags: List[str]) -> Dict:
+    """A caption variant in the SocialPostVariant shape (length measured once)."""
+    return {"text": text, "character_count": len(text), "hashtags": hashtags}
+
+
+def _build_quick_post_response(result: Dict, request: QuickSocialPostRequest) -> ORJSONResponse:
+    """
+    Turn the submitted captions into a response.
+
+    Variants are plain dicts in the QuickSocialPostResponse shape, encoded
+    directly with orjson rather than built and re-validated as models.
+    """
+    # Extract hashtags
+    hashtags = result.get("hashtags", [])
+    if not hashtags:
+        # Generate default hashtags if none provided
+        hashtags = ["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse AI response: {str(e)}")
-        logger.error(f"Response text: {response_text[:500]}")
-        # Fallback: create 5 simple variants
-        base_text = f"🏡 {request.address}\n💰 {request.price}\n{request.bedrooms}bed • {request.bathrooms}bath\n"
-        highlights_text = request.highlights or 'Beautiful property - contact us to arrange a viewing!'
-
-        fallback_variants = [
-            SocialPostVariant(
-                text=base_text + f"✨ {highlights_text}",
-                character_count=0,
-                hashtags=["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
-            ),
-            SocialPostVariant(
-                text=f"{request.address}\n\n• {request.bedrooms} Bedrooms\n• {request.bathrooms} Bathrooms\n• £{request.price}\n\nContact us to arrange a viewing!",
-                character_count=0,
-                hashtags=["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
-            ),
-            SocialPostVariant(
-                text=base_text + f"🔑 {highlights_text}\n\nDon't miss this opportunity!",
-                character_count=0,
-                hashtags=["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
-            ),
-            SocialPostVariant(
-                text=f"Presenting: {request.bedrooms}-bedroom property at {request.address}. Priced at £{request.price}. {request.bathrooms} bathrooms. Contact for viewing.",
-                character_count=0,
-                hashtags=["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
-            ),
-            SocialPostVariant(
-                text=f"Imagine coming home to {request.address}... {request.bedrooms} bedrooms, {request.bathrooms} bathrooms, yours for £{request.price}. Let's make it happen!",
-                character_count=0,
-                hashtags=["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
+    variants = [_quick_post_variant(result[key].strip(), hashtags) for key in _QUICK_POST_VARIANT_KEYS]
+
+    logger.info("✅ Final result: %s caption variants with %s hashtags for %s", len(variants), len(hashtags), request.platform)
+
+    return ORJSONResponse(content={"variants": variants, "hashtags": hashtags, "success": True})
+
+
+def _quick_post_fallback_response(request: QuickSocialPostRequest) -> ORJSONResponse:
+    """Build 5 simple template variants when the AI response is unusable."""
+    base_text = f"🏡 {request.address}\n💰 {request.price}\n{request.bedrooms}bed • {request.bathrooms}bath\n"
+    highlights_text = request.highlights or 'Beautiful property - contact us to arrange a viewing!'
+
+    fallback_hashtags = ["#Property", "#ForSale", "#RealEstate", "#DreamHome"]
+    fallback_texts = [
+        base_text + f"✨ {highlights_text}",
+        f"{request.address}\n\n• {request.bedrooms} Bedrooms\n• {request.bathrooms} Bathrooms\n• £{request.price}\n\nContact us to arrange a viewing!",
+        base_text + f"🔑 {highlights_text}\n\nDon't miss this opportunity!",
+        f"Presenting: {request.bedrooms}-bedroom property at {request.address}. Priced at £{request.price}. {request.bathrooms} bathrooms. Contact for viewing.",
+        f"Imagine coming home to {request.address}... {request.bedrooms} bedrooms, {request.bathrooms} bathrooms, yours for £{request.price}. Let's make it happen!"
+    ]
+    fallback_variants = [_quick_post_variant(text, fallback_hashtags) for text in fallback_texts]
+
+    logger.info("Using 5 fallback variants")
+    return ORJSONResponse(content={"variants": fallback_variants, "hashtags": [], "success": True})
+
+
+@fastapi_app.post("/api/quick-social-post", response_model=QuickSocialPostResponse)
+async def generate_quick_social_post(request: QuickSocialPostRequest):
+    """
+    Generate 3 social media caption variants for quick posting.
+    Lightweight endpoint optimized for speed - no full brochure generation.
+    """
+    if not claude_client or not claude_client.is_available():
+        raise HTTPException(status_code=503, detail="AI generation service not available")
+
+    try:
+        # Analyze images with vision if photos provided (up to 3, concurrently)
+        image_descriptions = []
+        if request.photos and len(request.photos) > 0:
+            logger.info("Analyzing %s photos for quick post", len(request.photos))
+            analyses = await asyncio.gather(
+                *(
+                    _analyze_quick_post_photo(photo_data, i)
+                    for i, photo_data in enumerate(request.photos[:3], 1)
+                ),
+                return_exceptions=True
             )
-        ]
-        for variant in fallback_variants:
-            variant.character_count = len(variant.text)
 
-        logger.info("Using 5 fallback variants due to JSON parse error")
-        return QuickSocialPostResponse(variants=fallback_variants, success=True)
+            for i, description in enumerate(analyses, 1):
+                if isinstance(description, Exception):
+                    logger.warning("Failed to analyze photo %s: %s", i, description)
+                    continue
+                if description:
+                    image_descriptions.append(f"Photo {i}: {description}")
+                    logger.info("Photo %s analyzed successfully", i)
+
+        # Build property details string
+        details = []
+        details.append(f"Address: {request.address}")
+        details.append(f"Price: {request.price}")
+        if request.bedrooms:
+            details.append(f"Bedrooms: {request.bedrooms}")
+        if request.bathrooms:
+            details.append(f"Bathrooms: {request.bathrooms}")
+        if request.highlights:
+            details.append(f"Highlights: {request.highlights}")
+
+        # Add image analysis if available
+        if image_descriptions:
+            details.append(f"\nProperty Images Analysis:")
+            details.extend(image_descriptions)
+
+        property_info = "\n".join(details)
+
+        # Platform-specific character limits, style and output token budget
+        # (5 captions at the character limit plus hashtags)
+        platform_config = {
+            "instagram": {"limit": 2200, "style": "engaging with emojis, perfect for visual content", "max_tokens": 2500},
+            "facebook": {"limit": 400, "style": "conversational and community-focused", "max_tokens": 1000},
+            "linkedin": {"limit": 700, "style": "professional and business-oriented", "max_tokens": 1500},
+            "twitter": {"limit": 280, "style": "concise and impactful", "max_tokens": 800}
+        }
+
+        config = platform_config.get(request.platform.lower(), platform_config["facebook"])
+
+        # Extract location components from address for hyper-localized hashtags
+        address_parts = request.address.split(',')
+        town_city = address_parts[0].strip() if len(address_parts) > 0 else ""
+        county = address_parts[-2].strip() if len(address_parts) > 2 else ""
+
+        # Static instructions go in the system prompt; only the
+        # property-specific details are sent as the per-request prompt
+        town_tag = town_city.replace(' ', '').replace('-', '')
+        county_tag = county.replace(' ', '').replace('-', '')
+        prompt = QUICK_POST_PROMPT_TEMPLATE.format_map({
+            "property_info": property_info,
+            "town_city": town_city,
+            "county": county,
+            "town_tag": town_tag,
+            "county_tag": county_tag,
+            "platform": request.platform.upper(),
+            "style": config['style'],
+            "limit": config['limit'],
+            "bedrooms": request.bedrooms
+        })
+
+        # Generate with Claude, constrained to the captions tool schema
+        result = await claude_client.generate_structured(
+            prompt=prompt,
+            tool_name=QUICK_POST_TOOL,
+            input_schema=QUICK_POST_SCHEMA,
+            temperature=0.8,
+            max_tokens=config['max_tokens'],
+            instructions=QUICK_POST_INSTRUCTIONS
+        )
+
+        if not all(isinstance(result.get(key), str) for key in _QUICK_POST_VARIANT_KEYS):
+            logger.error("AI response missing caption variants: %s", sorted(result))
+            return _quick_post_fallback_response(request)
+
+        return _build_quick_post_response(result, request)
 
     except Exception as e:
-        logger.error(f"Failed to generate quick social post: {str(e)}")
+        logger.error("Failed to generate quick social post: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -4444,17 +4577,37 @@ Return ONLY a JSON object with this EXACT structure:
 # USER PROFILE ENDPOINTS
 # ============================================================================
 
+# Profile and branding responses per user. Every profile write below drops
+# the user's entries, so the TTL only bounds staleness from outside edits.
+# Kept small: profiles embed base64 logos/photos of up to a few MB each.
+_profile_response_cache = CacheManager(max_size=256)
+PROFILE_CACHE_TTL_SECONDS = 60
+
+
+def _invalidate_profile_cache(user_id: str) -> None:
+    """Drop cached profile/branding responses for a user after a write."""
+    _profile_response_cache.delete(f"profile:{user_id}")
+    _profile_response_cache.delete(f"branding:{user_id}")
+
+
 @fastapi_app.get("/profile/{user_id}")
 async def get_user_profile(user_id: str):
     """Get user profile by user ID."""
     if not user_profile_service:
         raise HTTPException(status_code=503, detail="User profile service not available")
 
+    cache_key = f"profile:{user_id}"
+    cached = _profile_response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     profile = user_profile_service.load_profile(user_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    return profile.to_dict()
+    profile_data = profile.to_dict()
+    _profile_response_cache.set(cache_key, profile_data, ttl_seconds=PROFILE_CACHE_TTL_SECONDS)
+    return profile_data
 
 
 @fastapi_app.get("/profile/by-email/{email}")
@@ -4480,20 +4633,16 @@ async def upload_user_logo(
         raise HTTPException(status_code=503, detail="User profile service not available")
 
     try:
-        # Read logo file
-        logo_data = await logo.read()
-
-        # Save logo
-        logo_path = user_profile_service.save_logo(
-            user_id=user_id,
-            logo_data=logo_data,
-            filename=logo.filename
+        # Read and save the spooled upload off the event loop
+        logo_path = await asyncio.to_thread(
+            lambda: user_profile_service.save_logo(user_id, logo.file.read(), logo.filename)
         )
+        _invalidate_profile_cache(user_id)
 
         if not logo_path:
             raise HTTPException(status_code=500, detail="Failed to save logo")
 
-        logger.info(f"Logo uploaded for user {user_id}: {logo_path}")
+        logger.info("Logo uploaded for user %s: %s", user_id, logo_path)
 
         return {
             "success": True,
@@ -4502,7 +4651,7 @@ async def upload_user_logo(
         }
 
     except Exception as e:
-        logger.error(f"Failed to upload logo: {str(e)}")
+        logger.error("Failed to upload logo: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -4516,20 +4665,16 @@ async def upload_agent_photo(
         raise HTTPException(status_code=503, detail="User profile service not available")
 
     try:
-        # Read photo file
-        photo_data = await photo.read()
-
-        # Save photo
-        photo_path = user_profile_service.save_agent_photo(
-            user_id=user_id,
-            photo_data=photo_data,
-            filename=photo.filename
+        # Read and save the spooled upload off the event loop
+        photo_path = await asyncio.to_thread(
+            lambda: user_profile_service.save_agent_photo(user_id, photo.file.read(), photo.filename)
         )
+        _invalidate_profile_cache(user_id)
 
         if not photo_path:
             raise HTTPException(status_code=500, detail="Failed to save photo")
 
-        logger.info(f"Agent photo uploaded for user {user_id}: {photo_path}")
+        logger.info("Agent photo uploaded for user %s: %s", user_id, photo_path)
 
         return {
             "success": True,
@@ -4538,7 +4683,7 @@ async def upload_agent_photo(
         }
 
     except Exception as e:
-        logger.error(f"Failed to upload agent photo: {str(e)}")
+        logger.error("Failed to upload agent photo: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -4564,11 +4709,12 @@ async def update_user_branding(request: Request):
             primary_color=data.get("primary_color"),
             secondary_color=data.get("secondary_color")
         )
+        _invalidate_profile_cache(user_id)
 
         if not success:
             raise HTTPException(status_code=404, detail="Profile not found")
 
-        logger.info(f"Branding updated for user {user_id}")
+        logger.info("Branding updated for user %s", user_id)
 
         return {
             "success": True,
@@ -4578,7 +4724,7 @@ async def update_user_branding(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to update branding: {str(e)}")
+        logger.error("Failed to update branding: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -4588,7 +4734,11 @@ async def get_user_branding(user_id: str):
     if not user_profile_service:
         raise HTTPException(status_code=503, detail="User profile service not available")
 
-    branding = user_profile_service.get_branding_for_export(user_id)
+    cache_key = f"branding:{user_id}"
+    branding = _profile_response_cache.get(cache_key)
+    if branding is None:
+        branding = user_profile_service.get_branding_for_export(user_id)
+        _profile_response_cache.set(cache_key, branding, ttl_seconds=PROFILE_CACHE_TTL_SECONDS)
     return branding
 
 
@@ -4596,7 +4746,7 @@ async def get_user_branding(user_id: str):
 # PROPERTY AUTOFILL ENDPOINT
 # ============================================================================
 
-@fastapi_app.get("/property/autofill/{postcode}")
+@fastapi_app.get("/property/autofill/{postcode}", response_class=ORJSONResponse)
 async def autofill_property_data(postcode: str, address: Optional[str] = None):
     """Auto-fill property data based on postcode.
 
@@ -4616,25 +4766,49 @@ async def autofill_property_data(postcode: str, address: Optional[str] = None):
             address=address
         )
 
-        logger.info(f"Auto-filled property data for postcode: {postcode}")
+        logger.info("Auto-filled property data for postcode: %s", postcode)
 
-        return {
+        # Returned as a response so the dict skips FastAPI's jsonable_encoder pass
+        return ORJSONResponse(content={
             "success": True,
             "data": property_data
-        }
+        })
 
     except Exception as e:
-        logger.error(f"Failed to autofill property data: {str(e)}")
+        logger.error("Failed to autofill property data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Council tax bands and EPC rating info are fixed reference tables, so the
+# JSON bodies are encoded once at startup and served as-is.
+REFERENCE_DATA_MAX_AGE_SECONDS = 86400
+_VALID_EPC_RATINGS = frozenset("ABCDEFG")
+_council_tax_bands_json: Optional[bytes] = None
+_epc_info_json: Dict[str, bytes] = {}
+if property_autofill_service:
+    _council_tax_bands_json = orjson.dumps(property_autofill_service.get_council_tax_bands())
+    _epc_info_json = {
+        epc_rating: orjson.dumps(property_autofill_service.get_epc_rating_info(epc_rating))
+        for epc_rating in sorted(_VALID_EPC_RATINGS)
+    }
+
+
+def _reference_data_response(body: bytes) -> Response:
+    """Pre-encoded JSON reference data, cacheable by clients for a day."""
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={REFERENCE_DATA_MAX_AGE_SECONDS}"}
+    )
+
+
 @fastapi_app.get("/property/council-tax-bands")
 async def get_council_tax_bands():
     """Get council tax band information."""
     if not property_autofill_service:
         raise HTTPException(status_code=503, detail="Property autofill service not available")
 
-    return property_autofill_service.get_council_tax_bands()
+    return _reference_data_response(_council_tax_bands_json)
 
 
 @fastapi_app.get("/property/epc-info/{rating}")
@@ -4644,14 +4818,15 @@ async def get_epc_info(rating: str):
     Args:
         rating: EPC rating (A-G)
     """
-    if not property_autofill_service:
-        raise HTTPException(status_code=503, detail="Property autofill service not available")
-
+    # Reject bad ratings before anything else
     rating = rating.upper()
-    if rating not in ["A", "B", "C", "D", "E", "F", "G"]:
+    if rating not in _VALID_EPC_RATINGS:
         raise HTTPException(status_code=400, detail="Invalid EPC rating. Must be A-G")
 
-    return property_autofill_service.get_epc_rating_info(rating)
+    if not property_autofill_service:
+        raise HTTPException(status_code=503, detail="Property autofill service not available")
+
+    return _reference_data_response(_epc_info_json[rating])
 
 
 # ============================================================================
@@ -4782,11 +4957,16 @@ if __name__ == "__main__":
     host = settings.backend_host
     print(f"Host: {host}, Port: {port}", flush=True)
     print(f"RAILWAY_ENVIRONMENT: {os.environ.get('RAILWAY_ENVIRONMENT')}", flush=True)
+    reload = os.environ.get("RAILWAY_ENVIRONMENT") is None  # Only reload in dev
+    # Worker processes for production. Defaults to 1: each worker runs its own
+    # post scheduler and in-memory caches, so only scale out deliberately.
+    workers = None if reload else int(os.environ.get("WEB_CONCURRENCY", 1))
     uvicorn.run(
         "backend.main:app",
         host=host,
         port=port,
-        reload=os.environ.get("RAILWAY_ENVIRONMENT") is None  # Only reload in dev
+        reload=reload,
+        workers=workers
     )
 # Trigger reload for auth system
 # EPC service reload
@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation.
 """
 # Force reload
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -453,6 +453,8 @@ from datetime import datetime
 
 class BrochurePhoto(BaseModel):
     """Single photo in brochure with base64 data."""
+    model_config = ConfigDict(defer_build=True)
+
     id: str = Field(description="Unique photo identifier")
     name: str = Field(description="Original filename")
     category: str = Field(description="Photo category (cover, exterior, interior, kitchen, bedrooms, bathrooms, garden)")
@@ -466,6 +468,8 @@ class BrochurePhoto(BaseModel):
 
 class BrochurePage(BaseModel):
     """Single page in brochure."""
+    model_config = ConfigDict(defer_build=True)
+
     id: str = Field(description="Unique page identifier")
     type: str = Field(description="Page type (cover, details, gallery, location, etc.)")
     title: str = Field(description="Page title")
@@ -476,6 +480,8 @@ class BrochurePage(BaseModel):
 
 class BrochureSessionData(BaseModel):
     """Complete brochure state for session storage."""
+    model_config = ConfigDict(defer_build=True)
+
     session_id: Optional[str] = Field(default=None, description="Session identifier (set by server)")
     user_email: str = Field(description="User who created the session")
     property: Dict[str, Any] = Field(description="Property data from UnifiedBrochureState")
@@ -501,6 +507,8 @@ class BrochureSessionData(BaseModel):
 
 class BrochureSessionResponse(BaseModel):
     """Response when creating/loading session."""
+    model_config = ConfigDict(defer_build=True)
+
     session_id: str = Field(description="Unique session identifier")
     expires_at: datetime = Field(description="When session will expire")
     photo_urls: Dict[str, str] = Field(description="Mapping of photo_id to URL path")
@@ -509,6 +517,8 @@ class BrochureSessionResponse(BaseModel):
 
 class BrochureSessionCreateRequest(BaseModel):
     """Request to create new brochure editing session."""
+    model_config = ConfigDict(defer_build=True)
+
     user_email: str
     property: Dict[str, Any]
     agent: Dict[str, Any]
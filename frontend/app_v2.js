@@ -1596,19 +1596,20 @@ document.addEventListener('DOMContentLoaded', () => {
                         console.log('🔴 First page - id:', pg.id, 'type:', pg.type, 'title:', pg.title, 'order:', pg.order);
                     }
 
-                    // First call debug endpoint
-                    try {
-                        await fetch('/api/brochure/session-debug', {
-                            method: 'POST',
-                            headers: { 'Content-Type': 'application/json' },
-                            body: JSON.stringify(sessionPayload)
-                        });
-                    } catch (e) { console.log('Debug endpoint error:', e); }
+                    // Send photos as binary file parts (named by photo id) instead of base64 in JSON
+                    const sessionForm = new FormData();
+                    for (const photo of sessionPayload.photos) {
+                        if (photo.dataUrl && photo.dataUrl.startsWith('data:image')) {
+                            const blob = await (await fetch(photo.dataUrl)).blob();
+                            sessionForm.append('photos', blob, photo.id);
+                            photo.dataUrl = `FILE_STORED_${photo.id}`;
+                        }
+                    }
+                    sessionForm.append('metadata', JSON.stringify(sessionPayload));
 
-                    const sessionResponse = await fetch('/api/brochure/session', {
+                    const sessionResponse = await fetch('/api/brochure/session/multipart', {
                         method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(sessionPayload)
+                        body: sessionForm
                     });
 
                     if (!sessionResponse.ok) {
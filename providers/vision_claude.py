@@ -1,11 +1,34 @@
 """
 Claude vision provider using Anthropic's Claude API with vision capabilities.
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from io import BytesIO
+import asyncio
+import copy
+import hashlib
 import logging
 import anthropic
+import httpx
 import base64
+import orjson
 import os
+import re
+
+from PIL import Image
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# SIMD base64 encoder for multi-MB photos; stdlib fallback if not installed
+try:
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii')
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +39,247 @@ VISION_MODELS = {
     "opus": "claude-opus-4-20250514",           # Best quality, expensive
 }
 
+# Claude downscales anything larger than this on its side, so larger uploads
+# only cost bandwidth and latency. Oversized photos are resized before encoding.
+MAX_IMAGE_DIMENSION = 1568
+RESIZED_JPEG_QUALITY = 85
+
+# Fields Claude returns for each analysed image
+ANALYSIS_JSON_FORMAT = """{
+  "room_type": "kitchen|bedroom|bathroom|living_room|dining_room|garden|exterior|hallway|office|garage|other",
+  "detected_features": ["feature1", "feature2"],
+  "finishes": ["finish1", "finish2"],
+  "light_level": "bright|moderate|dim",
+  "view_hint": "garden_view|street_view|park_view|null",
+  "interior": true|false,
+  "orientation_hint": "front_aspect|rear_aspect|side_aspect|null",
+  "caption": "Simple factual 8-12 word description of what is visible",
+  "headline": "Room type in 2-4 words",
+  "selling_points": ["visible feature 1", "visible feature 2"]
+}"""
+
+# Feature/finish vocabulary and caption rules shared by single and batch prompts
+ANALYSIS_RULES = """VALID FEATURES (ONLY list if clearly visible):
+- Structural: fireplace, bay_window, sash_windows, french_doors, bifold_doors, skylights, exposed_beams
+- Outdoor: garden, driveway, garage, parking, patio, decking
+- Kitchen: kitchen_island, breakfast_bar, range_cooker, integrated_appliances
+- Bedroom: ensuite, fitted_wardrobes
+- Bathroom: freestanding_bath, walk_in_shower
+
+VALID FINISHES (ONLY list if clearly visible):
+- Floors: hardwood_floors, tiles, carpet, laminate
+- Surfaces: granite_countertops, wooden_worktops
+- Appliances: stainless_steel_appliances, integrated_appliances
+
+CAPTION RULES - BE FACTUAL:
+- ONLY describe what you can actually see in the photo
+- DO NOT invent features, finishes, or qualities not visible
+- DO NOT use marketing fluff like "stunning", "exceptional", "beautifully appointed"
+- DO NOT claim "quality finishes" unless you can specifically identify them
+- Simple descriptions like "Kitchen with cream units and tiled floor" are preferred
+- For exteriors: describe the building style and visible features only
+
+GOOD CAPTION EXAMPLES:
+- "Kitchen with cream cabinets, built-in oven, and dining area"
+- "Double bedroom with fitted wardrobes and carpet flooring"
+- "Semi-detached house with front garden and driveway"
+- "Living room with fireplace and bay window"
+
+BAD CAPTIONS (DO NOT USE):
+- "Stunning chef's kitchen with premium finishes" (marketing fluff)
+- "Property photograph with quality finishes throughout" (generic, not descriptive)
+- "Luxurious principal suite" (aspirational, not factual)"""
+
+# Tool input schema for one analysis, mirroring ANALYSIS_JSON_FORMAT. Claude is
+# forced to call the tool, so results arrive as decoded JSON rather than text.
+ANALYSIS_PROPERTIES = {
+    "room_type": {
+        "type": "string",
+        "enum": ["kitchen", "bedroom", "bathroom", "living_room", "dining_room", "garden",
+                 "exterior", "hallway", "office", "garage", "other"]
+    },
+    "detected_features": {"type": "array", "items": {"type": "string"}},
+    "finishes": {"type": "array", "items": {"type": "string"}},
+    "light_level": {"type": "string", "enum": ["bright", "moderate", "dim"]},
+    "view_hint": {"type": ["string", "null"]},
+    "interior": {"type": "boolean"},
+    "orientation_hint": {"type": ["string", "null"]},
+    "caption": {"type": "string"},
+    "headline": {"type": "string"},
+    "selling_points": {"type": "array", "items": {"type": "string"}}
+}
+
+ANALYSIS_TOOL = {
+    "name": "report_analysis",
+    "description": "Report the analysis of the property photograph.",
+    "input_schema": {
+        "type": "object",
+        "properties": ANALYSIS_PROPERTIES,
+        "required": ["room_type", "caption"]
+    }
+}
+
+BATCH_ANALYSIS_TOOL = {
+    "name": "report_analyses",
+    "description": "Report the analysis of each property photograph, one entry per image.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "analyses": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"index": {"type": "integer"}, **ANALYSIS_PROPERTIES},
+                    "required": ["index", "room_type", "caption"]
+                }
+            }
+        },
+        "required": ["analyses"]
+    }
+}
+
+# The VALID FEATURES vocabulary listed in ANALYSIS_RULES (keep in sync)
+VALID_FEATURES = frozenset({
+    "fireplace", "bay_window", "sash_windows", "french_doors", "bifold_doors", "skylights", "exposed_beams",
+    "garden", "driveway", "garage", "parking", "patio", "decking",
+    "kitchen_island", "breakfast_bar", "range_cooker", "integrated_appliances",
+    "ensuite", "fitted_wardrobes",
+    "freestanding_bath", "walk_in_shower",
+})
+
+# Prompt for analysing a single property image with JSON output
+ANALYSIS_PROMPT = (
+    "Analyze this property photograph. Describe ONLY what you can actually see.\n\n"
+    "You MUST respond with ONLY valid JSON in this exact format:\n"
+    f"{ANALYSIS_JSON_FORMAT}\n\n"
+    f"{ANALYSIS_RULES}\n\n"
+    "Respond with ONLY the JSON object."
+)
+
+# Prompt for analysing several images in one request
+BATCH_ANALYSIS_PROMPT = (
+    "Analyze each of the property photographs provided, labelled Image 0, Image 1, ... "
+    "in the order given. Describe ONLY what you can actually see in each one.\n\n"
+    "You MUST respond with ONLY a valid JSON array containing one object per image, "
+    "in image order. Each object has an \"index\" field (the image number) plus "
+    "these fields in this exact format:\n"
+    f"{ANALYSIS_JSON_FORMAT}\n\n"
+    f"{ANALYSIS_RULES}\n\n"
+    "Respond with ONLY the JSON array."
+)
+
+# Defaults for fields Claude leaves out. List values are copied per result
+# so callers can mutate them freely.
+DEFAULT_ANALYSIS = {
+    "filename": "",
+    "room_type": "other",
+    "detected_features": [],
+    "finishes": [],
+    "light_level": "moderate",
+    "view_hint": None,
+    "interior": True,
+    "orientation_hint": None,
+    "suggested_caption": "",
+    "headline": "",
+    "selling_points": []
+}
+
+# Image media types by lowercase file extension
+MEDIA_TYPES = {
+    '.png': "image/png",
+    '.jpg': "image/jpeg",
+    '.jpeg': "image/jpeg",
+    '.webp': "image/webp",
+    '.gif': "image/gif",
+}
+
+# Generic filler that indicates lazy output rather than a real feature.
+# Estate agent terms like "stunning", "beautiful" are allowed.
+GENERIC_FILLER_TERMS = (
+    "well_presented", "well presented", "modern_finish",
+    "good condition", "nice property", "attractive property",
+    "quality throughout", "well maintained"
+)
+# One case-insensitive alternation so each feature is scanned once, without lower()
+_GENERIC_FILLER_RE = re.compile(
+    "|".join(re.escape(term) for term in GENERIC_FILLER_TERMS), re.IGNORECASE
+)
+# Whole captions too generic to keep without review
+GENERIC_CAPTIONS = frozenset({'property', 'house', 'home', 'room'})
+
+# Analyses kept per image content hash (re-uploads of the same photo skip Claude)
+ANALYSIS_CACHE_MAX = 512
+
+# Claude requests this provider keeps in flight at once (single + batch)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Keep connections to the API warm between uploads instead of re-handshaking
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=120)
+# Same as the SDK's default timeout, which a custom http_client would otherwise drop
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Images per batched request (API allows 100; smaller batches keep responses short)
+MAX_BATCH_IMAGES = 20
+BATCH_TOKENS_PER_IMAGE = 400
+
+
+# One Anthropic client (and connection pool) per API key across all instances,
+# with a count of the instances using it so close() only shuts it down for the last
+_CLIENT_CACHE: Dict[str, anthropic.AsyncAnthropic] = {}
+_CLIENT_REFS: Dict[str, int] = {}
+
+
+def _shared_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """Get or create the pooled Anthropic client for an API key and take a reference."""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        # HTTP/2 (when h2 is installed) multiplexes concurrent analyses over one connection
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+            )
+        )
+        _CLIENT_CACHE[api_key] = client
+    _CLIENT_REFS[api_key] = _CLIENT_REFS.get(api_key, 0) + 1
+    return client
+
+
+async def _release_client(api_key: str) -> None:
+    """Drop a reference to the shared client, closing it once no instance uses it."""
+    refs = _CLIENT_REFS.get(api_key, 0) - 1
+    if refs > 0:
+        _CLIENT_REFS[api_key] = refs
+        return
+    _CLIENT_REFS.pop(api_key, None)
+    client = _CLIENT_CACHE.pop(api_key, None)
+    if client is not None:
+        await client.close()
+
+
+def _forced_tool(tool: Dict) -> Dict:
+    """Request body fields that make Claude answer by calling the given tool."""
+    # This SDK version predates typed tool params; pass them through the body
+    return {"tools": [tool], "tool_choice": {"type": "tool", "name": tool["name"]}}
+
+
+def _tool_input(message, tool_name: str) -> Optional[Dict]:
+    """Input of the named tool call in a response, if Claude made one."""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == tool_name and isinstance(block.input, dict):
+            return block.input
+    return None
+
+
+def _response_text(message) -> str:
+    """Concatenated text blocks of a response."""
+    return "".join(block.text for block in message.content if block.type == "text")
+
+
+def _as_str(value) -> str:
+    """Claude's JSON values are almost always strings already; only convert others."""
+    return value if type(value) is str else str(value)
+
 
 class VisionClaudeClient:
     """
@@ -38,15 +302,31 @@ class VisionClaudeClient:
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY is required for Claude vision")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Async client so the Claude round-trip doesn't block the event loop;
+        # shared per API key so every instance reuses one connection pool
+        self.client = _shared_client(self.api_key)
+        self._closed = False
         self.rate_limiter = rate_limiter
 
         # Get model from parameter, env var, or default to haiku (cheapest)
         model_key = model or os.getenv('VISION_MODEL', 'haiku').lower()
         self.model = VISION_MODELS.get(model_key, VISION_MODELS['haiku'])
 
+        # LRU of analyses keyed by image content hash
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+        # Bounds concurrent Claude calls when many images are analysed at once
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
         logger.info(f"Initialized Claude vision client with model: {self.model}")
 
+    async def close(self):
+        """Release the shared Anthropic client; its connections close with the last user."""
+        if self._closed:
+            return
+        self._closed = True
+        await _release_client(self.api_key)
+
     async def analyze_image(self, image_bytes: bytes, filename: str) -> Dict:
         """
         Analyze property image using Claude's vision API.
@@ -58,217 +338,373 @@ class VisionClaudeClient:
         Returns:
             Structured analysis dict
         """
-        logger.debug(f"Claude analyzing: {filename}")
-
-        # Encode image to base64
-        image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+        key = await asyncio.to_thread(self._image_digest, image_bytes)
+        cached = self._cache_get(key, filename)
+        if cached is not None:
+            logger.debug("Analysis cache hit for %s", filename)
+            return cached
+
+        analysis = await self._analyze_single(image_bytes, filename)
+        self._cache_put(key, analysis)
+        return analysis
 
-        # Determine media type from filename
-        media_type = self._get_media_type(filename)
+    async def _analyze_single(self, image_bytes: bytes, filename: str) -> Dict:
+        """Analyze one image with its own Claude request (no cache lookup)."""
+        logger.debug("Claude analyzing: %s", filename)
 
-        # Create the vision analysis prompt
-        prompt = self._build_analysis_prompt()
+        # Downscale + base64-encode in one worker-thread hop (CPU-bound, so off
+        # the event loop); only the encoded block is held during the API wait
+        image_block = await asyncio.to_thread(self._prepare_image_block, image_bytes, filename)
+        image_bytes = None
 
         try:
             # Apply global rate limiting if available
             if self.rate_limiter:
                 await self.rate_limiter.wait_if_needed()
-                logger.debug(f"Rate limiter enforced for {filename}")
+                logger.debug("Rate limiter enforced for %s", filename)
 
             # Call Claude with vision using configured model
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": media_type,
-                                    "data": image_base64,
-                                },
-                            },
-                            {
-                                "type": "text",
-                                "text": prompt
-                            }
-                        ],
-                    }
-                ],
-            )
+            # Static instructions go in the system prompt; the user turn
+            # carries only the image
+            async with self._request_semaphore:
+                message = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=1024,
+                    system=ANALYSIS_PROMPT,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [
+                                image_block,
+                                {
+                                    "type": "text",
+                                    "text": "Analyze this image."
+                                }
+                            ],
+                        }
+                    ],
+                    extra_body=_forced_tool(ANALYSIS_TOOL),
+                )
+
+        except Exception as e:
+            logger.error("Claude vision analysis failed for %s: %s", filename, e)
+            # Return minimal analysis that flags the image needs manual review
+            return self._fallback_analysis(filename, error=str(e))
+
+        # Use the tool input directly; parse any plain-text reply as before
+        tool_input = _tool_input(message, ANALYSIS_TOOL["name"])
+        if tool_input is not None:
+            analysis = self._default_result(filename)
+            self._apply_parsed(analysis, tool_input)
+        else:
+            analysis = self._parse_claude_response(_response_text(message), filename)
+
+        # Validate the response - check for hallucination indicators
+        analysis = self._validate_analysis(analysis, filename)
+
+        logger.debug("Successfully analyzed %s: %s", filename, analysis['room_type'])
+        return analysis
+
+    async def analyze_images(self, items: List[Tuple[bytes, str]]) -> List[Dict]:
+        """
+        Analyze several property images, batching them into shared Claude requests.
+
+        Up to MAX_BATCH_IMAGES images go in each request, so the prompt and
+        round-trip are paid once per batch instead of once per image.
+
+        Args:
+            items: List of (image_bytes, filename) tuples
+
+        Returns:
+            Structured analysis dicts, in the same order as items
+        """
+        keys = await asyncio.to_thread(lambda: [self._image_digest(image_bytes) for image_bytes, _ in items])
+        results: List[Optional[Dict]] = [
+            self._cache_get(key, filename) for key, (_, filename) in zip(keys, items)
+        ]
 
-            # Parse Claude's response
-            response_text = message.content[0].text
-            analysis = self._parse_claude_response(response_text, filename)
+        # Only images not seen before go to Claude
+        pending = [index for index, analysis in enumerate(results) if analysis is None]
+        if len(pending) < len(items):
+            logger.debug("Analysis cache hits: %d of %d", len(items) - len(pending), len(items))
+
+        batches = [pending[i:i + MAX_BATCH_IMAGES] for i in range(0, len(pending), MAX_BATCH_IMAGES)]
+        batch_results = await asyncio.gather(
+            *(self._analyze_batch([items[index] for index in batch]) for batch in batches)
+        )
+        for batch, analyses in zip(batches, batch_results):
+            for index, analysis in zip(batch, analyses):
+                self._cache_put(keys[index], analysis)
+                results[index] = analysis
+
+        return results
+
+    async def _analyze_batch(self, items: List[Tuple[bytes, str]]) -> List[Dict]:
+        """Analyze one batch of images with a single Claude request."""
+        if len(items) == 1:
+            return [await self._analyze_single(*items[0])]
+
+        filenames = [filename for _, filename in items]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Claude analyzing batch of %d: %s", len(items), ', '.join(filenames))
+
+        image_blocks = await asyncio.gather(
+            *(asyncio.to_thread(self._prepare_image_block, image_bytes, filename) for image_bytes, filename in items)
+        )
+
+        # Label each image so the response can refer to it by index
+        content = []
+        for index, image_block in enumerate(image_blocks):
+            content.append({"type": "text", "text": f"Image {index}:"})
+            content.append(image_block)
+        content.append({"type": "text", "text": f"Analyze these {len(items)} images."})
 
-            # Validate the response - check for hallucination indicators
-            analysis = self._validate_analysis(analysis, filename)
+        try:
+            if self.rate_limiter:
+                await self.rate_limiter.wait_if_needed()
+                logger.debug("Rate limiter enforced for batch of %d", len(items))
 
-            logger.debug(f"Successfully analyzed {filename}: {analysis['room_type']}")
-            return analysis
+            async with self._request_semaphore:
+                message = await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=min(8192, BATCH_TOKENS_PER_IMAGE * len(items) + 256),
+                    system=BATCH_ANALYSIS_PROMPT,
+                    messages=[{"role": "user", "content": content}],
+                    extra_body=_forced_tool(BATCH_ANALYSIS_TOOL),
+                )
 
         except Exception as e:
-            logger.error(f"Claude vision analysis failed for {filename}: {str(e)}")
-            # Return minimal analysis that flags the image needs manual review
-            return self._fallback_analysis(filename, error=str(e))
+            logger.error("Claude batch vision analysis failed for %d images: %s", len(items), e)
+            return [self._fallback_analysis(filename, error=str(e)) for filename in filenames]
 
-    def _get_media_type(self, filename: str) -> str:
-        """Determine media type from filename extension."""
-        filename_lower = filename.lower()
-        if filename_lower.endswith('.png'):
-            return "image/png"
-        elif filename_lower.endswith(('.jpg', '.jpeg')):
-            return "image/jpeg"
-        elif filename_lower.endswith('.webp'):
-            return "image/webp"
-        elif filename_lower.endswith('.gif'):
-            return "image/gif"
+        tool_input = _tool_input(message, BATCH_ANALYSIS_TOOL["name"])
+        if tool_input is not None:
+            parsed_by_index = self._index_batch_entries(tool_input.get('analyses'), len(items))
         else:
-            return "image/jpeg"  # Default
+            parsed_by_index = self._parse_batch_response(_response_text(message), len(items))
+
+        results: List[Optional[Dict]] = []
+        missing = []
+        for index, filename in enumerate(filenames):
+            parsed = parsed_by_index.get(index)
+            if parsed is None:
+                missing.append(index)
+                results.append(None)
+                continue
+            analysis = self._default_result(filename)
+            self._apply_parsed(analysis, parsed)
+            results.append(self._validate_analysis(analysis, filename))
 
-    def _build_analysis_prompt(self) -> str:
-        """Build the prompt for Claude to analyze the property image with JSON output."""
-        return """Analyze this property photograph. Describe ONLY what you can actually see.
+        # Anything the batch response didn't cover is analysed on its own
+        if missing:
+            logger.warning("Batch response missing %d of %d images, analyzing individually", len(missing), len(items))
+            retried = await asyncio.gather(*(self._analyze_single(*items[index]) for index in missing))
+            for index, analysis in zip(missing, retried):
+                results[index] = analysis
 
-You MUST respond with ONLY valid JSON in this exact format:
-{
-  "room_type": "kitchen|bedroom|bathroom|living_room|dining_room|garden|exterior|hallway|office|garage|other",
-  "detected_features": ["feature1", "feature2"],
-  "finishes": ["finish1", "finish2"],
-  "light_level": "bright|moderate|dim",
-  "view_hint": "garden_view|street_view|park_view|null",
-  "interior": true|false,
-  "orientation_hint": "front_aspect|rear_aspect|side_aspect|null",
-  "caption": "Simple factual 8-12 word description of what is visible",
-  "headline": "Room type in 2-4 words",
-  "selling_points": ["visible feature 1", "visible feature 2"]
-}
+        return results
 
-VALID FEATURES (ONLY list if clearly visible):
-- Structural: fireplace, bay_window, sash_windows, french_doors, bifold_doors, skylights, exposed_beams
-- Outdoor: garden, driveway, garage, parking, patio, decking
-- Kitchen: kitchen_island, breakfast_bar, range_cooker, integrated_appliances
-- Bedroom: ensuite, fitted_wardrobes
-- Bathroom: freestanding_bath, walk_in_shower
+    def _parse_batch_response(self, response_text: str, count: int) -> Dict[int, Dict]:
+        """
+        Parse a batch response's JSON array into {image_index: parsed_object}.
 
-VALID FINISHES (ONLY list if clearly visible):
-- Floors: hardwood_floors, tiles, carpet, laminate
-- Surfaces: granite_countertops, wooden_worktops
-- Appliances: stainless_steel_appliances, integrated_appliances
+        Entries without a usable index fall back to their array position.
+        Returns an empty dict if no JSON array can be parsed.
+        """
+        start = response_text.find('[')
+        end = response_text.rfind(']') + 1
+        if start == -1 or end <= start:
+            logger.warning("No JSON array found in batch response")
+            return {}
 
-CAPTION RULES - BE FACTUAL:
-- ONLY describe what you can actually see in the photo
-- DO NOT invent features, finishes, or qualities not visible
-- DO NOT use marketing fluff like "stunning", "exceptional", "beautifully appointed"
-- DO NOT claim "quality finishes" unless you can specifically identify them
-- Simple descriptions like "Kitchen with cream units and tiled floor" are preferred
-- For exteriors: describe the building style and visible features only
+        try:
+            parsed = orjson.loads(response_text[start:end])
+        except orjson.JSONDecodeError as e:
+            logger.warning("JSON parse error in batch response: %s", e)
+            return {}
 
-GOOD CAPTION EXAMPLES:
-- "Kitchen with cream cabinets, built-in oven, and dining area"
-- "Double bedroom with fitted wardrobes and carpet flooring"
-- "Semi-detached house with front garden and driveway"
-- "Living room with fireplace and bay window"
+        return self._index_batch_entries(parsed, count)
 
-BAD CAPTIONS (DO NOT USE):
-- "Stunning chef's kitchen with premium finishes" (marketing fluff)
-- "Property photograph with quality finishes throughout" (generic, not descriptive)
-- "Luxurious principal suite" (aspirational, not factual)
+    @staticmethod
+    def _index_batch_entries(entries, count: int) -> Dict[int, Dict]:
+        """
+        Map a list of batch analysis objects to {image_index: parsed_object}.
 
-Respond with ONLY the JSON object."""
+        Entries without a usable index fall back to their list position.
+        """
+        if not isinstance(entries, list):
+            return {}
 
-    def _parse_claude_response(self, response_text: str, filename: str) -> Dict:
-        """Parse Claude's JSON response into a dict."""
-        import json
-        import re
+        by_index = {}
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            index = entry.get('index', position)
+            if not isinstance(index, int) or not 0 <= index < count:
+                index = position
+            if 0 <= index < count and index not in by_index:
+                by_index[index] = entry
+        return by_index
+
+    @staticmethod
+    def _image_digest(image_bytes: bytes) -> str:
+        """Content hash used as the analysis cache key."""
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str, filename: str) -> Optional[Dict]:
+        """Return a copy of a cached analysis (with this filename), or None."""
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        self._cache.move_to_end(key)
+        analysis = copy.deepcopy(cached)
+        analysis["filename"] = filename
+        return analysis
 
-        # Default result structure
-        result = {
-            "filename": filename,
-            "room_type": "other",
-            "detected_features": [],
-            "finishes": [],
-            "light_level": "moderate",
-            "view_hint": None,
-            "interior": True,
-            "orientation_hint": None,
-            "suggested_caption": "",
-            "headline": "",
-            "selling_points": []
+    def _cache_put(self, key: str, analysis: Dict) -> None:
+        """Cache a successful analysis; flagged/fallback results are not kept."""
+        if analysis.get("needs_review"):
+            return
+        self._cache[key] = copy.deepcopy(analysis)
+        self._cache.move_to_end(key)
+        while len(self._cache) > ANALYSIS_CACHE_MAX:
+            self._cache.popitem(last=False)
+
+    def _prepare_image_block(self, image_bytes: bytes, filename: str) -> Dict:
+        """Downscale (if needed) and encode an image as a messages API block."""
+        image_bytes, media_type = self._preprocess_image(image_bytes, filename)
+        return self._image_block(image_bytes, media_type)
+
+    def _image_block(self, image_bytes: Union[bytes, memoryview], media_type: str) -> Dict:
+        """Base64 image content block for the messages API."""
+        return {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": b64encode_as_string(image_bytes),
+            },
         }
 
+    def _preprocess_image(self, image_bytes: bytes, filename: str) -> Tuple[Union[bytes, memoryview], str]:
+        """
+        Resize images larger than MAX_IMAGE_DIMENSION and re-encode as JPEG.
+
+        Images already within the limit are sent unchanged.
+
+        Returns:
+            Tuple of (image_bytes, media_type)
+        """
         try:
-            # Try to extract JSON from the response (in case there's extra text)
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                json_str = json_match.group()
-                parsed = json.loads(json_str)
-
-                # Map parsed values to result
-                if 'room_type' in parsed:
-                    result['room_type'] = str(parsed['room_type']).lower()
-                if 'detected_features' in parsed and isinstance(parsed['detected_features'], list):
-                    result['detected_features'] = [str(f).strip() for f in parsed['detected_features'] if f]
-                if 'finishes' in parsed and isinstance(parsed['finishes'], list):
-                    result['finishes'] = [str(f).strip() for f in parsed['finishes'] if f]
-                if 'light_level' in parsed:
-                    result['light_level'] = str(parsed['light_level']).lower()
-                if 'view_hint' in parsed:
-                    vh = parsed['view_hint']
-                    result['view_hint'] = None if vh in [None, 'null', 'none'] else str(vh).lower()
-                if 'interior' in parsed:
-                    result['interior'] = bool(parsed['interior'])
-                if 'orientation_hint' in parsed:
-                    oh = parsed['orientation_hint']
-                    result['orientation_hint'] = None if oh in [None, 'null', 'none'] else str(oh).lower()
-                if 'caption' in parsed:
-                    result['suggested_caption'] = str(parsed['caption'])
-                if 'headline' in parsed:
-                    result['headline'] = str(parsed['headline'])
-                if 'selling_points' in parsed and isinstance(parsed['selling_points'], list):
-                    result['selling_points'] = [str(p).strip() for p in parsed['selling_points'] if p]
-
-                logger.debug(f"Successfully parsed JSON response for {filename}")
+            image = Image.open(BytesIO(image_bytes))
+            if max(image.size) <= MAX_IMAGE_DIMENSION:
+                return image_bytes, self._get_media_type(filename)
+
+            original_size = image.size
+            image.thumbnail((MAX_IMAGE_DIMENSION, MAX_IMAGE_DIMENSION), Image.LANCZOS)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+
+            output = BytesIO()
+            image.save(output, format="JPEG", quality=RESIZED_JPEG_QUALITY, optimize=True)
+            # View of the JPEG buffer; the encoder reads it without a bytes copy
+            resized = output.getbuffer()
+            logger.debug(
+                "Resized %s from %dx%d to %dx%d (%d -> %d bytes)",
+                filename, original_size[0], original_size[1],
+                image.size[0], image.size[1], len(image_bytes), resized.nbytes
+            )
+            return resized, "image/jpeg"
+
+        except Exception as e:
+            logger.warning("Image preprocessing failed for %s, sending original: %s", filename, e)
+            return image_bytes, self._get_media_type(filename)
+
+    def _get_media_type(self, filename: str) -> str:
+        """Determine media type from filename extension."""
+        return MEDIA_TYPES.get(os.path.splitext(filename)[1].lower(), "image/jpeg")  # Default JPEG
+
+    def _parse_claude_response(self, response_text: str, filename: str) -> Dict:
+        """Parse Claude's JSON response into a dict."""
+        result = self._default_result(filename)
+
+        try:
+            # Outermost {...} span, in case the JSON is wrapped in extra text
+            start = response_text.find('{')
+            end = response_text.rfind('}') + 1
+            if start != -1 and end > start:
+                parsed = orjson.loads(response_text[start:end])
+                self._apply_parsed(result, parsed)
+                logger.debug("Successfully parsed JSON response for %s", filename)
             else:
-                logger.warning(f"No JSON found in response for {filename}, falling back to text parsing")
+                logger.warning("No JSON found in response for %s, falling back to text parsing", filename)
                 result = self._parse_text_response(response_text, filename, result)
 
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON parse error for {filename}: {e}, falling back to text parsing")
+        except orjson.JSONDecodeError as e:
+            logger.warning("JSON parse error for %s: %s, falling back to text parsing", filename, e)
             result = self._parse_text_response(response_text, filename, result)
 
         return result
 
+    def _default_result(self, filename: str) -> Dict:
+        """Default analysis structure, filled in from Claude's parsed JSON."""
+        result = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in DEFAULT_ANALYSIS.items()
+        }
+        result["filename"] = filename
+        return result
+
+    def _apply_parsed(self, result: Dict, parsed: Dict) -> None:
+        """Map the fields of one parsed JSON analysis onto a result dict."""
+        if 'room_type' in parsed:
+            result['room_type'] = _as_str(parsed['room_type']).lower()
+        if 'detected_features' in parsed and isinstance(parsed['detected_features'], list):
+            result['detected_features'] = [_as_str(f).strip() for f in parsed['detected_features'] if f]
+        if 'finishes' in parsed and isinstance(parsed['finishes'], list):
+            result['finishes'] = [_as_str(f).strip() for f in parsed['finishes'] if f]
+        if 'light_level' in parsed:
+            result['light_level'] = _as_str(parsed['light_level']).lower()
+        if 'view_hint' in parsed:
+            vh = parsed['view_hint']
+            result['view_hint'] = None if vh in [None, 'null', 'none'] else _as_str(vh).lower()
+        if 'interior' in parsed:
+            result['interior'] = bool(parsed['interior'])
+        if 'orientation_hint' in parsed:
+            oh = parsed['orientation_hint']
+            result['orientation_hint'] = None if oh in [None, 'null', 'none'] else _as_str(oh).lower()
+        if 'caption' in parsed:
+            result['suggested_caption'] = _as_str(parsed['caption'])
+        if 'headline' in parsed:
+            result['headline'] = _as_str(parsed['headline'])
+        if 'selling_points' in parsed and isinstance(parsed['selling_points'], list):
+            result['selling_points'] = [_as_str(p).strip() for p in parsed['selling_points'] if p]
+
     def _parse_text_response(self, response_text: str, filename: str, result: Dict) -> Dict:
         """Fallback text parser for non-JSON responses."""
-        lines = response_text.strip().split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if ':' not in line:
+        for line in response_text.splitlines():
+            key, sep, value = line.partition(':')
+            if not sep:
                 continue
 
-            key, value = line.split(':', 1)
             key = key.strip().lower().replace('"', '').replace("'", "")
             value = value.strip().strip('"').strip("'")
+            value_lower = value.lower()
 
             if 'room_type' in key:
-                result['room_type'] = value.lower()
+                result['room_type'] = value_lower
             elif 'detected_features' in key or 'features' in key:
                 result['detected_features'] = [f.strip().strip('"') for f in value.split(',') if f.strip()]
             elif 'finishes' in key:
                 result['finishes'] = [f.strip().strip('"') for f in value.split(',') if f.strip()]
             elif 'light_level' in key:
-                result['light_level'] = value.lower()
+                result['light_level'] = value_lower
             elif 'view_hint' in key:
-                result['view_hint'] = None if value.lower() in ['none', 'null'] else value.lower()
+                result['view_hint'] = None if value_lower in ('none', 'null') else value_lower
             elif 'interior' in key:
-                result['interior'] = value.lower() == 'true'
+                result['interior'] = value_lower == 'true'
             elif 'orientation' in key:
-                result['orientation_hint'] = None if value.lower() in ['none', 'null'] else value.lower()
+                result['orientation_hint'] = None if value_lower in ('none', 'null') else value_lower
             elif 'caption' in key:
                 result['suggested_caption'] = value
 
@@ -280,30 +716,19 @@ Respond with ONLY the JSON object."""
         Now tuned for estate agent language - allows aspirational terms but catches
         truly generic filler content.
         """
-        # Only flag truly generic/filler terms that indicate lazy output
-        # Estate agent terms like "stunning", "beautiful" are now allowed
-        GENERIC_FILLER_TERMS = [
-            "well_presented", "well presented", "modern_finish",
-            "good condition", "nice property", "attractive property",
-            "quality throughout", "well maintained"
+        # Drop generic filler from detected features (not real features);
+        # terms from the prompt's vocabulary can't be filler, so skip the scan
+        analysis['detected_features'] = [
+            feature for feature in analysis.get('detected_features', [])
+            if feature in VALID_FEATURES or not _GENERIC_FILLER_RE.search(feature)
         ]
 
-        # Check detected features for generic filler (not real features)
-        valid_features = []
-        for feature in analysis.get('detected_features', []):
-            feature_lower = feature.lower()
-            # Only filter out if it's a generic filler, not a real feature
-            if not any(filler in feature_lower for filler in GENERIC_FILLER_TERMS):
-                valid_features.append(feature)
-
-        analysis['detected_features'] = valid_features
-
         # Only flag caption if it's extremely generic (just "Property" or similar)
         caption = analysis.get('suggested_caption', '').strip()
-        if len(caption) < 20 or caption.lower() in ['property', 'house', 'home', 'room']:
+        if len(caption) < 20 or caption.lower() in GENERIC_CAPTIONS:
             room_type = analysis.get('room_type', 'room')
             analysis['needs_review'] = True
-            logger.warning(f"Caption too short/generic for {filename}: '{caption}'")
+            logger.warning("Caption too short/generic for %s: '%s'", filename, caption)
 
         return analysis
 
@@ -312,7 +737,7 @@ Respond with ONLY the JSON object."""
         Fallback analysis if Claude API fails.
         Returns honest minimal data instead of hallucinated content.
         """
-        logger.warning(f"Using fallback analysis for {filename}" + (f": {error}" if error else ""))
+        logger.warning("Using fallback analysis for %s%s", filename, f": {error}" if error else "")
 
         return {
             "filename": filename,
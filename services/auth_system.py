@@ -75,6 +75,13 @@ class AuthSystem:
         self.storage_path = storage_path
         self._ensure_storage_exists()
 
+        # In-memory per-office indices, rebuilt whenever the storage file changes
+        # (including writes from other worker processes)
+        self._brochures_by_office: Dict[str, List[Dict]] = {}
+        self._uploads_by_office: Dict[str, List[Dict]] = {}
+        self._indexed_version: Optional[tuple] = None
+        self._build_indices()
+
     def _ensure_storage_exists(self):
         """Create auth storage with Savills demo data."""
         if not os.path.exists(self.storage_path):
@@ -273,6 +280,28 @@ class AuthSystem:
             logger.error(f"Error loading auth data: {e}")
             return {}
 
+    def _storage_version(self) -> Optional[tuple]:
+        """Modification time and size of the storage file, or None if unreadable."""
+        try:
+            stat = os.stat(self.storage_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _build_indices(self, data: Optional[Dict] = None):
+        """Build per-office brochure and upload indices from storage."""
+        version = self._storage_version()
+        if data is None:
+            data = self._load_data()
+        self._brochures_by_office = dict(data.get("office_brochures", {}))
+        self._uploads_by_office = dict(data.get("photographer_uploads", {}))
+        self._indexed_version = version
+
+    def _refresh_indices(self):
+        """Rebuild the indices if the storage file changed since they were built."""
+        if self._storage_version() != self._indexed_version:
+            self._build_indices()
+
     def _save_data(self, data: Dict):
         """Save auth data to storage."""
         try:
@@ -364,8 +393,8 @@ class AuthSystem:
         Returns:
             List of brochure metadata
         """
-        data = self._load_data()
-        return data.get("office_brochures", {}).get(office_id, [])
+        self._refresh_indices()
+        return self._brochures_by_office.get(office_id, [])
 
     def add_brochure_to_office(self, office_id: str, brochure_data: Dict):
         """
@@ -376,15 +405,14 @@ class AuthSystem:
             brochure_data: Brochure metadata
         """
         data = self._load_data()
+        office_brochures = data.setdefault("office_brochures", {}).setdefault(office_id, [])
 
-        if office_id not in data.get("office_brochures", {}):
-            data["office_brochures"][office_id] = []
-
-        brochure_data["brochure_id"] = f"br_{len(data['office_brochures'][office_id]) + 1:03d}"
+        brochure_data["brochure_id"] = f"br_{len(office_brochures) + 1:03d}"
         brochure_data["created_at"] = datetime.utcnow().isoformat() + "Z"
 
-        data["office_brochures"][office_id].append(brochure_data)
+        office_brochures.append(brochure_data)
         self._save_data(data)
+        self._build_indices(data)
 
         logger.info(f"Added brochure {brochure_data['brochure_id']} to {office_id}")
 
@@ -400,8 +428,8 @@ class AuthSystem:
         Returns:
             List of photo upload batches
         """
-        data = self._load_data()
-        return data.get("photographer_uploads", {}).get(office_id, [])
+        self._refresh_indices()
+        return self._uploads_by_office.get(office_id, [])
 
     def add_photographer_upload(self, office_id: str, upload_data: Dict):
         """
@@ -412,16 +440,15 @@ class AuthSystem:
             upload_data: Upload metadata with photos
         """
         data = self._load_data()
+        office_uploads = data.setdefault("photographer_uploads", {}).setdefault(office_id, [])
 
-        if office_id not in data.get("photographer_uploads", {}):
-            data["photographer_uploads"][office_id] = []
-
-        upload_data["upload_id"] = f"upl_{len(data['photographer_uploads'][office_id]) + 1:03d}"
+        upload_data["upload_id"] = f"upl_{len(office_uploads) + 1:03d}"
         upload_data["uploaded_at"] = datetime.utcnow().isoformat() + "Z"
         upload_data["status"] = "pending_agent_assignment"
 
-        data["photographer_uploads"][office_id].append(upload_data)
+        office_uploads.append(upload_data)
         self._save_data(data)
+        self._build_indices(data)
 
         logger.info(f"Added photographer upload {upload_data['upload_id']} to {office_id}")
 
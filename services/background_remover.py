@@ -60,10 +60,10 @@ class BackgroundRemover:
         try:
             from rembg import remove
 
-            # Decode input image
-            if ',' in image_base64:
-                # Handle data URL format
-                image_base64 = image_base64.split(',')[1]
+            # Decode input image (strip data URL header if present)
+            _, sep, payload = image_base64.partition(',')
+            if sep:
+                image_base64 = payload
 
             image_data = base64.b64decode(image_base64)
             input_image = Image.open(io.BytesIO(image_data))
@@ -10,13 +10,15 @@ Handles:
 """
 
 import json
-import base64
+import os
+import binascii
 import uuid
 import re
 import shutil
+import sqlite3
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, Tuple, Optional
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, List, Tuple, Optional
 import logging
 
 from backend.schemas import (
@@ -28,6 +30,18 @@ from backend.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Photo IDs become file names, so uploaded ones are restricted to a safe charset
+_PHOTO_ID_RE = re.compile(r'^[\w\-]+$')
+
+# File extension for each accepted upload content type
+_UPLOAD_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+
 
 class BrochureSessionService:
     """Manages brochure editing sessions with persistent storage."""
@@ -43,21 +57,76 @@ class BrochureSessionService:
         self.base_dir = base_dir or Path("brochure_sessions")
         self.expiry_hours = expiry_hours
         self.base_dir.mkdir(exist_ok=True, parents=True)
+        self.index_path = self.base_dir / "sessions.db"
+        self._init_expiry_index()
         logger.info(f"📁 Brochure session storage: {self.base_dir.absolute()}")
 
-    def create_session(self, data: BrochureSessionData) -> BrochureSessionResponse:
+    def _init_expiry_index(self) -> None:
+        """
+        Create the SQLite expiry index, backfilling it from existing sessions.
+
+        The index lets cleanup_expired find expired sessions with one indexed
+        query instead of opening every session.json on disk.
+        """
+        conn = sqlite3.connect(self.index_path)
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'"
+            ).fetchone()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, expires_at TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at)")
+
+            if not exists:
+                rows = []
+                for session_dir in self.base_dir.iterdir():
+                    session_file = session_dir / "session.json"
+                    if not session_file.is_file():
+                        continue
+                    try:
+                        with open(session_file, 'r', encoding='utf-8') as f:
+                            expires_at_str = json.load(f).get('expires_at')
+                        if expires_at_str:
+                            expires_at = datetime.fromisoformat(expires_at_str.replace('Z', '+00:00'))
+                            rows.append((session_dir.name, self._index_timestamp(expires_at)))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to index session {session_dir.name}: {e}")
+                conn.executemany("INSERT OR REPLACE INTO sessions VALUES (?, ?)", rows)
+                if rows:
+                    logger.info(f"📇 Indexed {len(rows)} existing sessions for expiry")
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _index_timestamp(value: datetime) -> str:
+        """Fixed-width naive-UTC ISO string, so index values sort chronologically."""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec='microseconds')
+
+    def create_session(
+        self,
+        data: BrochureSessionData,
+        uploads: Optional[Dict[str, Tuple[BinaryIO, str]]] = None
+    ) -> BrochureSessionResponse:
         """
         Create new editing session with photo storage.
 
         Process:
         1. Generate unique session ID
         2. Create session directory structure
-        3. Decode and save all photos as files
+        3. Decode and save all photos as files (or copy uploaded files)
         4. Save metadata to session.json
         5. Return session info with photo URLs
 
         Args:
             data: Complete brochure state
+            uploads: Optional photo_id -> (file object, content type) map of
+                multipart uploads; when given, photo bytes are streamed from
+                these instead of being decoded from each photo's dataUrl
 
         Returns:
             Session response with ID and photo URL mappings
@@ -83,36 +152,34 @@ class BrochureSessionService:
             data.updated_at = now
             data.expires_at = expires_at
 
-            # Save photos to disk and build URL mapping
-            photo_urls = {}
-            saved_photo_count = 0
-
-            for photo in data.photos:
-                try:
-                    # Save photo file
-                    photo_path = self._save_photo_file(session_id, photo)
+            if uploads is not None:
+                saved_photo_ids = self._copy_uploaded_photos(photos_dir, data, uploads)
+            else:
+                # Decode all photos first, then write them in one batch
+                pending_files: List[Tuple[str, Path, bytes]] = []
 
-                    # Build URL for this photo
-                    photo_url = f"/api/brochure/session/{session_id}/photo/{photo.id}"
-                    photo_urls[photo.id] = photo_url
+                for photo in data.photos:
+                    try:
+                        image_data, extension = self._decode_base64_photo(photo.dataUrl)
+                        pending_files.append((photo.id, photos_dir / f"{photo.id}{extension}", image_data))
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to decode photo {photo.id}: {e}")
+                        continue
 
-                    saved_photo_count += 1
+                saved_photo_ids = self._write_photo_files(pending_files)
 
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to save photo {photo.id}: {e}")
-                    continue
+            # Build URL mapping for the photos that made it to disk
+            photo_urls = {
+                photo_id: f"/api/brochure/session/{session_id}/photo/{photo_id}"
+                for photo_id in saved_photo_ids
+            }
 
-            logger.info(f"✅ Saved {saved_photo_count}/{len(data.photos)} photos")
+            logger.info(f"✅ Saved {len(photo_urls)}/{len(data.photos)} photos")
 
             # Remove dataUrl from photos in metadata (we have files now)
             # This saves disk space in session.json
             session_data_dict = data.dict()
 
-            # 🔥 FORENSIC: Log photos BEFORE cleaning dataUrl
-            logger.info(f"🔥 [FORENSIC-PRE-JSON] Photos in dict BEFORE cleaning:")
-            for i, photo in enumerate(session_data_dict.get('photos', [])[:2]):  # Just first 2
-                logger.info(f"    Photo {i}: name={photo.get('name')}, has_analysis={'analysis' in photo}, analysis={photo.get('analysis')}")
-
             for photo in session_data_dict.get('photos', []):
                 if 'dataUrl' in photo:
                     # Keep just a placeholder
@@ -124,16 +191,22 @@ class BrochureSessionService:
                     if 'dataUrl' in photo:
                         photo['dataUrl'] = f"FILE_STORED_{photo['id']}"
 
-            # 🔥 FORENSIC: Log photos AFTER cleaning dataUrl (before JSON save)
-            logger.info(f"🔥 [FORENSIC-FINAL-JSON] Photos in dict AFTER cleaning (about to save):")
-            for i, photo in enumerate(session_data_dict.get('photos', [])[:2]):  # Just first 2
-                logger.info(f"    Photo {i}: name={photo.get('name')}, has_analysis={'analysis' in photo}, analysis={photo.get('analysis')}")
-
             # Save metadata
             session_file = session_dir / "session.json"
             with open(session_file, 'w', encoding='utf-8') as f:
                 json.dump(session_data_dict, f, indent=2, default=str)
 
+            # Record expiry in the index used by cleanup_expired
+            conn = sqlite3.connect(self.index_path)
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+                    (session_id, self._index_timestamp(expires_at))
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
             logger.info(f"✅ Session {session_id} created successfully")
 
             return BrochureSessionResponse(
@@ -185,8 +258,8 @@ class BrochureSessionService:
                 if datetime.utcnow() > expires_at:
                     raise ValueError(f"Session {session_id} has expired")
 
-            # Parse into Pydantic model
-            session_data = BrochureSessionData(**data_dict)
+            # Build model without re-validation (data was validated before it was stored)
+            session_data = self._construct_session_data(data_dict)
 
             logger.info(f"✅ Session {session_id} loaded successfully")
 
@@ -196,6 +269,39 @@ class BrochureSessionService:
             logger.error(f"❌ Failed to load session {session_id}: {e}")
             raise
 
+    def _construct_session_data(self, data_dict: Dict) -> BrochureSessionData:
+        """
+        Build session model from trusted server-side JSON via model_construct.
+
+        Skips Pydantic validation, so nested photos/pages and the timestamp
+        fields (stored as strings) are converted explicitly.
+
+        Args:
+            data_dict: Parsed session.json contents
+
+        Returns:
+            Brochure session data
+        """
+        def construct_photo(photo_dict: Dict) -> BrochurePhoto:
+            return BrochurePhoto.model_construct(**photo_dict)
+
+        fields = dict(data_dict)
+        fields['photos'] = [construct_photo(p) for p in data_dict.get('photos', [])]
+        fields['pages'] = [
+            BrochurePage.model_construct(**{
+                **page,
+                'photos': [construct_photo(p) for p in page.get('photos', [])]
+            })
+            for page in data_dict.get('pages', [])
+        ]
+
+        for key in ('created_at', 'updated_at', 'expires_at'):
+            value = fields.get(key)
+            if isinstance(value, str):
+                fields[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+        return BrochureSessionData.model_construct(**fields)
+
     def update_session(self, session_id: str, data: BrochureSessionData) -> None:
         """
         Update existing session (for auto-save).
@@ -302,43 +408,47 @@ class BrochureSessionService:
         """
         Delete all expired sessions.
 
+        Expired sessions are looked up through the SQLite expiry index rather
+        than by scanning every session directory.
+
         Returns:
             Number of sessions deleted
         """
-        deleted_count = 0
-        now = datetime.utcnow()
+        deleted_ids = []
+        now = self._index_timestamp(datetime.utcnow())
 
         logger.info("🧹 Starting expired session cleanup...")
 
-        for session_dir in self.base_dir.iterdir():
-            if not session_dir.is_dir():
-                continue
+        conn = sqlite3.connect(self.index_path)
+        try:
+            expired_ids = [
+                row[0] for row in conn.execute(
+                    "SELECT session_id FROM sessions WHERE expires_at < ?", (now,)
+                )
+            ]
 
-            session_file = session_dir / "session.json"
-            if not session_file.exists():
-                continue
+            for session_id in expired_ids:
+                try:
+                    self._validate_session_id(session_id)
+                    try:
+                        shutil.rmtree(self.base_dir / session_id)
+                    except FileNotFoundError:
+                        pass  # Already gone; just drop the index row
+                    # Index rows are only dropped for directories actually removed,
+                    # so failed deletions are retried on the next run
+                    deleted_ids.append((session_id,))
+                    logger.info(f"🗑️ Deleted expired session {session_id}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to delete session {session_id}: {e}")
+                    continue
 
-            try:
-                # Check expiry
-                with open(session_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                expires_at_str = data.get('expires_at')
-                if expires_at_str:
-                    expires_at = datetime.fromisoformat(expires_at_str.replace('Z', '+00:00'))
-
-                    if now > expires_at:
-                        # Expired - delete
-                        shutil.rmtree(session_dir)
-                        deleted_count += 1
-                        logger.info(f"🗑️ Deleted expired session {session_dir.name}")
-
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to check session {session_dir.name}: {e}")
-                continue
+            conn.executemany("DELETE FROM sessions WHERE session_id = ?", deleted_ids)
+            conn.commit()
+        finally:
+            conn.close()
 
-        logger.info(f"✅ Cleanup complete: {deleted_count} sessions deleted")
-        return deleted_count
+        logger.info(f"✅ Cleanup complete: {len(deleted_ids)} sessions deleted")
+        return len(deleted_ids)
 
     def _save_photo_file(self, session_id: str, photo: BrochurePhoto) -> Path:
         """
@@ -366,6 +476,80 @@ class BrochureSessionService:
 
         return photo_path
 
+    def _write_photo_files(self, files: List[Tuple[str, Path, bytes]]) -> List[str]:
+        """
+        Write a batch of decoded photos to disk.
+
+        Uses raw os.open/os.write so each file costs one open, write and
+        close, without the buffered-IO layer's extra fstat/lseek calls.
+
+        Args:
+            files: (photo_id, path, image_bytes) tuples
+
+        Returns:
+            IDs of the photos that were written successfully
+        """
+        written = []
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+        for photo_id, photo_path, image_data in files:
+            try:
+                fd = os.open(photo_path, flags, 0o644)
+                try:
+                    view = memoryview(image_data)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+                written.append(photo_id)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to save photo {photo_id}: {e}")
+
+        return written
+
+    def _copy_uploaded_photos(
+        self,
+        photos_dir: Path,
+        data: BrochureSessionData,
+        uploads: Dict[str, Tuple[BinaryIO, str]]
+    ) -> List[str]:
+        """
+        Stream multipart photo uploads into the session's photos directory.
+
+        Files are copied in chunks, so no photo is ever held fully in memory.
+
+        Args:
+            photos_dir: Destination directory
+            data: Session data whose photo IDs the uploads are matched against
+            uploads: photo_id -> (file object, content type)
+
+        Returns:
+            IDs of the photos that were written successfully
+        """
+        written = []
+
+        for photo in data.photos:
+            upload = uploads.get(photo.id)
+            if upload is None:
+                logger.warning(f"⚠️ No upload received for photo {photo.id}")
+                continue
+            if not _PHOTO_ID_RE.match(photo.id):
+                logger.warning(f"⚠️ Rejected upload with unsafe photo ID: {photo.id!r}")
+                continue
+
+            fileobj, content_type = upload
+            extension = _UPLOAD_EXTENSIONS.get((content_type or '').lower(), '.jpg')
+
+            try:
+                fileobj.seek(0)
+                with open(photos_dir / f"{photo.id}{extension}", 'wb') as f:
+                    shutil.copyfileobj(fileobj, f)
+                written.append(photo.id)
+            except OSError as e:
+                logger.warning(f"⚠️ Failed to save photo {photo.id}: {e}")
+
+        return written
+
     def _decode_base64_photo(self, data_url: str) -> Tuple[bytes, str]:
         """
         Extract image data and file extension from base64 data URL.
@@ -383,8 +567,8 @@ class BrochureSessionService:
         # Format: data:image/jpeg;base64,/9j/4AAQSkZJRg...
         header, encoded = data_url.split(',', 1)
 
-        # Decode base64
-        image_data = base64.b64decode(encoded)
+        # Decode base64 (binascii directly, skipping base64.b64decode's wrapper)
+        image_data = binascii.a2b_base64(encoded)
 
         # Determine file extension from MIME type
         if 'jpeg' in header or 'jpg' in header:
@@ -14,19 +14,23 @@ class CacheManager:
     Features:
     - TTL-based expiry (items expire after a set time)
     - LRU eviction (least recently used items removed when cache is full)
+    - Periodic sweep of expired items on write, so unread entries don't linger
     - Thread-safe for async usage
     """
     
-    def __init__(self, max_size: int = 1000):
+    def __init__(self, max_size: int = 1000, sweep_interval_seconds: int = 60):
         """
         Initialize the cache manager.
         
         Args:
             max_size: Maximum number of items to store
+            sweep_interval_seconds: Minimum time between expired-item sweeps
         """
         self.max_size = max_size
         self._cache: OrderedDict = OrderedDict()
         self._expiry: dict[str, datetime] = {}
+        self._sweep_interval = timedelta(seconds=sweep_interval_seconds)
+        self._next_sweep = datetime.now() + self._sweep_interval
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -61,13 +65,17 @@ class CacheManager:
             value: Value to cache
             ttl_seconds: Time to live in seconds (default: 1 hour)
         """
+        now = datetime.now()
+        if now >= self._next_sweep:
+            self._remove_expired(now)
+        
         # If key exists, remove it first (to update position)
         if key in self._cache:
             del self._cache[key]
         
         # Add new item
         self._cache[key] = value
-        self._expiry[key] = datetime.now() + timedelta(seconds=ttl_seconds)
+        self._expiry[key] = now + timedelta(seconds=ttl_seconds)
         
         # Enforce max size (LRU eviction)
         while len(self._cache) > self.max_size:
@@ -77,6 +85,24 @@ class CacheManager:
             if oldest_key in self._expiry:
                 del self._expiry[oldest_key]
     
+    def _remove_expired(self, now: datetime):
+        """Drop every expired item and schedule the next sweep."""
+        expired = [key for key, expires_at in self._expiry.items() if now > expires_at]
+        for key in expired:
+            self._cache.pop(key, None)
+            del self._expiry[key]
+        self._next_sweep = now + self._sweep_interval
+    
+    def delete(self, key: str):
+        """
+        Remove a single item from the cache, if present.
+        
+        Args:
+            key: Cache key
+        """
+        self._cache.pop(key, None)
+        self._expiry.pop(key, None)
+    
     def clear(self):
         """Clear all cached items."""
         self._cache.clear()
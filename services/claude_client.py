@@ -2,13 +2,15 @@
 Claude API client wrapper for property listing generation.
 """
 import anthropic
-from typing import Optional
+from typing import Any, Dict, Optional
 import logging
 
 from backend.config import settings
 
 logger = logging.getLogger(__name__)
 
+SYSTEM_PROMPT = "You are a professional property copywriter. Generate the requested content DIRECTLY without asking questions, without conversational responses, and without explanations. Output ONLY the requested text content. Never start with 'I understand' or ask for more information - just write the content using the details provided."
+
 
 class ClaudeClient:
     """
@@ -34,7 +36,8 @@ class ClaudeClient:
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        instructions: Optional[str] = None
     ) -> str:
         """
         Generate a completion using Claude.
@@ -44,6 +47,8 @@ class ClaudeClient:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature (0-1)
             model: Model to use
+            instructions: Static instructions shared across requests;
+                sent in the system prompt after SYSTEM_PROMPT
             
         Returns:
             Generated text
@@ -61,11 +66,13 @@ class ClaudeClient:
         try:
             logger.info(f"Calling Claude API ({model}) with {max_tokens} max tokens, temp={temperature}")
 
+            system = self._system_prompt(instructions)
+
             message = self.client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system="You are a professional property copywriter. Generate the requested content DIRECTLY without asking questions, without conversational responses, and without explanations. Output ONLY the requested text content. Never start with 'I understand' or ask for more information - just write the content using the details provided.",
+                system=system,
                 messages=[
                     {
                         "role": "user",
@@ -90,6 +97,89 @@ class ClaudeClient:
             logger.error(f"Unexpected error: {e}")
             raise Exception(f"Unexpected error: {str(e)}")
     
+    async def generate_structured(
+        self,
+        prompt: str,
+        tool_name: str,
+        input_schema: Dict[str, Any],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        model: Optional[str] = None,
+        instructions: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate structured output by forcing Claude to call a single tool.
+
+        The tool's input_schema constrains the response shape, so the result
+        is a decoded dict rather than free text that has to be parsed.
+
+        Args:
+            prompt: The prompt to send to Claude
+            tool_name: Name of the tool Claude must call
+            input_schema: JSON schema for the tool input
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0-1)
+            model: Model to use
+            instructions: Static instructions shared across requests
+                (see generate_completion)
+
+        Returns:
+            The tool input generated by Claude
+
+        Raises:
+            Exception: If API call fails or no tool call is returned
+        """
+        if not self.client:
+            raise Exception("Claude API client not initialized. Set ANTHROPIC_API_KEY.")
+
+        if model is None:
+            model = settings.claude_model
+
+        try:
+            logger.info(f"Calling Claude API ({model}) for {tool_name} with {max_tokens} max tokens, temp={temperature}")
+
+            system = self._system_prompt(instructions)
+
+            # This SDK version predates typed tool params; pass them through the body
+            message = self.client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                extra_body={
+                    "tools": [{"name": tool_name, "input_schema": input_schema}],
+                    "tool_choice": {"type": "tool", "name": tool_name}
+                }
+            )
+
+        except anthropic.APIError as e:
+            logger.error(f"Claude API error: {e}")
+            raise Exception(f"Claude API error: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            raise Exception(f"Unexpected error: {str(e)}")
+
+        for block in message.content:
+            if block.type == "tool_use" and block.name == tool_name:
+                if message.stop_reason == "max_tokens":
+                    logger.warning(f"Claude {tool_name} output hit the {max_tokens} token limit")
+                return block.input
+
+        raise Exception(f"Claude response did not include a {tool_name} call")
+
+    @staticmethod
+    def _system_prompt(instructions: Optional[str]) -> str:
+        """Build the system prompt for a request."""
+        if not instructions:
+            return SYSTEM_PROMPT
+        return f"{SYSTEM_PROMPT}\n\n{instructions}"
+
     def is_available(self) -> bool:
         """
         Check if the Claude API client is available.
@@ -3,8 +3,11 @@ Hashtag Service - Provides trending and curated hashtags for social media posts
 Integrates with Google Trends and maintains a curated database of proven UK property hashtags
 """
 import logging
+import math
+import random
 import httpx
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import AbstractSet, List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,187 +26,241 @@ class HashtagService:
     """
 
     # Curated database of proven high-engagement UK property hashtags
+    # (tuples: read-only, so categories can be handed out without copying)
     CURATED_HASHTAGS = {
         # General property hashtags (high engagement)
-        "general": [
+        "general": (
             "#PropertyForSale", "#NewListing", "#JustListed", "#HomeForSale",
             "#RealEstate", "#PropertyUK", "#UKProperty", "#DreamHome",
             "#HouseHunting", "#HomeSweetHome", "#PropertyMarket", "#MovingHome",
             "#NewHome", "#ForSale", "#OnTheMarket", "#PropertySearch"
-        ],
+        ),
 
         # Property types
-        "detached": [
+        "detached": (
             "#DetachedHouse", "#DetachedHome", "#FamilyHome", "#DetachedProperty",
             "#SpaceLiving", "#GardenLovers", "#PrivateGarden"
-        ],
-        "semi_detached": [
+        ),
+        "semi_detached": (
             "#SemiDetached", "#SemiDetachedHouse", "#FamilyHome", "#SuburbanLiving"
-        ],
-        "terraced": [
+        ),
+        "terraced": (
             "#TerracedHouse", "#TerraceHome", "#PeriodProperty", "#CharacterHome"
-        ],
-        "flat": [
+        ),
+        "flat": (
             "#FlatForSale", "#ApartmentForSale", "#CityLiving", "#ModernLiving",
             "#ApartmentLife", "#FlatHunting", "#CityApartment"
-        ],
-        "cottage": [
+        ),
+        "cottage": (
             "#CottageLife", "#CountryCottage", "#PeriodCottage", "#RuralLiving",
             "#CottageCore", "#CountryLiving", "#QuaintCottage", "#EnglishCottage"
-        ],
-        "bungalow": [
+        ),
+        "bungalow": (
             "#Bungalow", "#BungalowLife", "#SingleStorey", "#RetirementHome",
             "#AccessibleHome", "#GroundFloorLiving"
-        ],
-        "penthouse": [
+        ),
+        "penthouse": (
             "#Penthouse", "#LuxuryLiving", "#PenthouseLife", "#CityViews",
             "#LuxuryProperty", "#HighRiseLiving"
-        ],
-        "mansion": [
+        ),
+        "mansion": (
             "#MansionForSale", "#LuxuryHome", "#GrandHome", "#PrestigeProperty",
             "#LuxuryRealEstate", "#DreamMansion"
-        ],
+        ),
 
         # UK regions and cities
-        "london": [
+        "london": (
             "#LondonProperty", "#LondonHomes", "#LondonRealEstate", "#PropertyLondon",
             "#LondonLiving", "#CapitalLiving", "#LondonLife"
-        ],
-        "manchester": [
+        ),
+        "manchester": (
             "#ManchesterProperty", "#ManchesterHomes", "#PropertyManchester",
             "#ManchesterLiving", "#NorthWestProperty"
-        ],
-        "birmingham": [
+        ),
+        "birmingham": (
             "#BirminghamProperty", "#BirminghamHomes", "#PropertyBirmingham",
             "#MidlandsProperty", "#BrumHomes"
-        ],
-        "bristol": [
+        ),
+        "bristol": (
             "#BristolProperty", "#BristolHomes", "#PropertyBristol",
             "#SouthWestProperty", "#BristolLiving"
-        ],
-        "edinburgh": [
+        ),
+        "edinburgh": (
             "#EdinburghProperty", "#EdinburghHomes", "#PropertyEdinburgh",
             "#ScotlandProperty", "#ScottishHomes"
-        ],
-        "leeds": [
+        ),
+        "leeds": (
             "#LeedsProperty", "#LeedsHomes", "#PropertyLeeds",
             "#YorkshireProperty", "#WestYorkshire"
-        ],
-        "liverpool": [
+        ),
+        "liverpool": (
             "#LiverpoolProperty", "#LiverpoolHomes", "#PropertyLiverpool",
             "#MerseysideProperty"
-        ],
-        "cotswolds": [
+        ),
+        "cotswolds": (
             "#CotswoldsProperty", "#CotswoldsHomes", "#CotswoldLiving",
             "#CotswoldLife", "#GloucestershireProperty", "#RuralCotswolds"
-        ],
-        "surrey": [
+        ),
+        "surrey": (
             "#SurreyProperty", "#SurreyHomes", "#PropertySurrey",
             "#SurreyLiving", "#HomeCounties"
-        ],
-        "kent": [
+        ),
+        "kent": (
             "#KentProperty", "#KentHomes", "#PropertyKent",
             "#GardenOfEngland", "#KentLiving"
-        ],
-        "sussex": [
+        ),
+        "sussex": (
             "#SussexProperty", "#SussexHomes", "#PropertySussex",
             "#EastSussex", "#WestSussex"
-        ],
-        "cornwall": [
+        ),
+        "cornwall": (
             "#CornwallProperty", "#CornwallHomes", "#PropertyCornwall",
             "#CornishProperty", "#CoastalLiving"
-        ],
-        "devon": [
+        ),
+        "devon": (
             "#DevonProperty", "#DevonHomes", "#PropertyDevon",
             "#SouthDevon", "#DevonLiving"
-        ],
-        "yorkshire": [
+        ),
+        "yorkshire": (
             "#YorkshireProperty", "#YorkshireHomes", "#PropertyYorkshire",
             "#NorthYorkshire", "#YorkshireLiving"
-        ],
-        "scotland": [
+        ),
+        "scotland": (
             "#ScotlandProperty", "#ScottishHomes", "#PropertyScotland",
             "#HighlandsProperty", "#ScottishLiving"
-        ],
-        "wales": [
+        ),
+        "wales": (
             "#WalesProperty", "#WelshHomes", "#PropertyWales",
             "#WelshProperty", "#WalesLiving"
-        ],
+        ),
 
         # Target audiences
-        "first_time_buyers": [
+        "first_time_buyers": (
             "#FirstTimeBuyer", "#FirstHome", "#GetOnTheLadder", "#StarterHome",
             "#FirstTimeHome", "#PropertyLadder", "#FTB"
-        ],
-        "families": [
+        ),
+        "families": (
             "#FamilyHome", "#FamilyHouse", "#GrowingFamily", "#FamilyLiving",
             "#ChildFriendly", "#SchoolCatchment", "#FamilyFriendly"
-        ],
-        "investors": [
+        ),
+        "investors": (
             "#PropertyInvestment", "#BTL", "#BuyToLet", "#PropertyPortfolio",
             "#InvestmentProperty", "#RentalProperty", "#PropertyInvestor"
-        ],
-        "downsizers": [
+        ),
+        "downsizers": (
             "#Downsizing", "#DownsizeHome", "#RetirementProperty", "#CompactLiving",
             "#EmptyNesters", "#NextChapter"
-        ],
-        "luxury": [
+        ),
+        "luxury": (
             "#LuxuryProperty", "#PrestigeHomes", "#LuxuryRealEstate", "#PrimeProperty",
             "#ExclusiveHomes", "#HighEndProperty", "#LuxuryLiving"
-        ],
+        ),
 
         # Features
-        "garden": [
+        "garden": (
             "#GardenLovers", "#OutdoorSpace", "#GardenGoals", "#GardenLife",
             "#SouthFacingGarden", "#LargeGarden"
-        ],
-        "parking": [
+        ),
+        "parking": (
             "#Driveway", "#Garage", "#OffStreetParking", "#DoubleGarage",
             "#ParkingSpace"
-        ],
-        "period": [
+        ),
+        "period": (
             "#PeriodProperty", "#PeriodHome", "#CharacterProperty", "#OriginalFeatures",
             "#VictorianHome", "#GeorgianProperty", "#EdwardianHome"
-        ],
-        "modern": [
+        ),
+        "modern": (
             "#ModernHome", "#ContemporaryLiving", "#NewBuild", "#ModernDesign",
             "#OpenPlanLiving"
-        ],
-        "renovation": [
+        ),
+        "renovation": (
             "#DoerUpper", "#RenovationProject", "#PropertyPotential", "#Fixer Upper",
             "#ProjectProperty"
-        ],
-        "views": [
+        ),
+        "views": (
             "#PropertyWithViews", "#CountryViews", "#SeaViews", "#RoomWithAView",
             "#PanoramicViews"
-        ],
+        ),
 
         # Seasonal
-        "spring": [
+        "spring": (
             "#SpringProperty", "#SpringMarket", "#SpringMove", "#NewBeginnings"
-        ],
-        "summer": [
+        ),
+        "summer": (
             "#SummerMove", "#SummerProperty", "#GardenSeason"
-        ],
-        "autumn": [
+        ),
+        "autumn": (
             "#AutumnMove", "#AutumnProperty", "#CozyHome"
-        ],
-        "winter": [
+        ),
+        "winter": (
             "#WinterMove", "#NewYearNewHome", "#ChristmasMove"
-        ],
+        ),
 
         # Platform specific (Instagram performs better with these)
-        "instagram_optimized": [
+        "instagram_optimized": (
             "#PropertyGoals", "#HomeInspo", "#InteriorGoals", "#HouseGoals",
             "#DreamHouseGoals", "#HomeDecor", "#InteriorDesign", "#Househunters"
-        ],
+        ),
 
         # Engagement boosters
-        "engagement": [
+        "engagement": (
             "#PropertyTour", "#HouseTour", "#VirtualTour", "#WalkThrough",
             "#BeforeAndAfter", "#PropertyOfTheDay", "#HomeOfTheDay"
-        ]
+        )
+    }
+
+    # Location substrings mapped to category keys (major cities/regions)
+    LOCATION_MAPPINGS = {
+        "london": "london",
+        "manchester": "manchester",
+        "birmingham": "birmingham",
+        "bristol": "bristol",
+        "edinburgh": "edinburgh",
+        "leeds": "leeds",
+        "liverpool": "liverpool",
+        "cotswold": "cotswolds",
+        "surrey": "surrey",
+        "kent": "kent",
+        "sussex": "sussex",
+        "cornwall": "cornwall",
+        "devon": "devon",
+        "yorkshire": "yorkshire",
+        "scotland": "scotland",
+        "wales": "wales",
+        "glasgow": "scotland",
+        "cardiff": "wales",
+        "bath": "bristol",
+        "oxford": "cotswolds",
+        "cambridge": "general"
+    }
+
+    # Season for each month, indexed by datetime.month (index 0 unused)
+    SEASON_BY_MONTH = (
+        None,
+        "winter", "winter",
+        "spring", "spring", "spring",
+        "summer", "summer", "summer",
+        "autumn", "autumn", "autumn",
+        "winter"
+    )
+
+    # Per-platform (max hashtag count, note) pairs, checked in order
+    OPTIMIZATION_NOTES = {
+        "instagram": (
+            (9, "Consider adding more hashtags (Instagram allows up to 30, optimal is 11-15)"),
+            (15, "Optimal hashtag count for Instagram engagement"),
+            (math.inf, "Good hashtag coverage")
+        ),
+        "twitter": (
+            (3, "Good for Twitter"),
+            (math.inf, "Twitter performs better with 1-3 hashtags")
+        ),
+        "facebook": (
+            (5, "Good for Facebook"),
+            (math.inf, "Facebook posts perform better with fewer hashtags (3-5)")
+        )
     }
+    DEFAULT_OPTIMIZATION_NOTES = ((math.inf, "Hashtags ready"),)
 
     # Google Trends related keywords for property searches
     TRENDING_PROPERTY_TERMS = [
@@ -213,10 +270,19 @@ class HashtagService:
 
     def __init__(self):
         """Initialize hashtag service"""
-        self.http_client = httpx.AsyncClient(timeout=10.0)
+        # Created on first use; trending data is currently simulated, so most
+        # processes never need a connection pool
+        self._http_client: Optional[httpx.AsyncClient] = None
         logger.info("HashtagService initialized with curated database")
 
-    async def get_hashtags(
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client for external trend lookups (created lazily)"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=10.0)
+        return self._http_client
+
+    def get_hashtags(
         self,
         property_type: Optional[str] = None,
         location: Optional[str] = None,
@@ -239,80 +305,124 @@ class HashtagService:
         Returns:
             Dictionary with categorized hashtags and metadata
         """
-        hashtags = []
+        platform_key = platform.lower()
+        draws, categories_used = self._resolve_categories(
+            property_type,
+            location,
+            target_audience,
+            tuple(features[:3]) if features else (),  # Max 3 features
+            platform_key == "instagram"
+        )
+
+        # Add seasonal hashtags
+        season = self._get_current_season()
+        if season in self.CURATED_HASHTAGS:
+            draws = draws + ((season, 1),)
+
+        # Draw in order, stopping once max_hashtags are collected. Each draw
+        # excludes tags already picked, so results never need deduping and a
+        # category shared with an earlier one still contributes its full count
+        final_hashtags = []
+        picked = set()
+        for category, count in draws:
+            if len(final_hashtags) >= max_hashtags:
+                break
+            tags = self._get_random_from_category(category, count, exclude=picked)
+            picked.update(tags)
+            final_hashtags.extend(tags)
+
+        # Limit to max_hashtags
+        final_hashtags = final_hashtags[:max_hashtags]
+
+        return {
+            "hashtags": final_hashtags,
+            "count": len(final_hashtags),
+            "categories_used": list(categories_used),
+            "platform": platform,
+            "optimization_notes": self._get_optimization_notes(platform_key, len(final_hashtags))
+        }
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _resolve_categories(
+        cls,
+        property_type: Optional[str],
+        location: Optional[str],
+        target_audience: Optional[str],
+        features: Tuple[str, ...],
+        instagram: bool
+    ) -> Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...]]:
+        """
+        Resolve the request inputs to the categories hashtags are drawn from.
+
+        Only the random draw differs between identical requests, so this part
+        is cached.
+
+        Returns:
+            Tuple of ((category, count) draws in priority order, unique categories_used)
+        """
+        draws = []
         categories_used = []
 
         # Always include some general hashtags
-        hashtags.extend(self._get_random_from_category("general", 4))
+        draws.append(("general", 4))
         categories_used.append("general")
 
         # Add property type specific hashtags
         if property_type:
-            type_key = self._normalize_property_type(property_type)
-            if type_key in self.CURATED_HASHTAGS:
-                hashtags.extend(self._get_random_from_category(type_key, 3))
+            type_key = cls._normalize_property_type(property_type)
+            if type_key in cls.CURATED_HASHTAGS:
+                draws.append((type_key, 3))
                 categories_used.append(type_key)
 
         # Add location-based hashtags
         if location:
-            location_key = self._normalize_location(location)
-            if location_key in self.CURATED_HASHTAGS:
-                hashtags.extend(self._get_random_from_category(location_key, 3))
+            location_key = cls._normalize_location(location)
+            if location_key in cls.CURATED_HASHTAGS:
+                draws.append((location_key, 3))
                 categories_used.append(location_key)
 
         # Add audience-targeted hashtags
         if target_audience:
-            audience_key = self._normalize_audience(target_audience)
-            if audience_key in self.CURATED_HASHTAGS:
-                hashtags.extend(self._get_random_from_category(audience_key, 2))
+            audience_key = cls._normalize_audience(target_audience)
+            if audience_key in cls.CURATED_HASHTAGS:
+                draws.append((audience_key, 2))
                 categories_used.append(audience_key)
 
         # Add feature-based hashtags
-        if features:
-            for feature in features[:3]:  # Max 3 features
-                feature_key = self._normalize_feature(feature)
-                if feature_key in self.CURATED_HASHTAGS:
-                    hashtags.extend(self._get_random_from_category(feature_key, 2))
-                    categories_used.append(feature_key)
+        for feature in features:
+            feature_key = cls._normalize_feature(feature)
+            if feature_key in cls.CURATED_HASHTAGS:
+                draws.append((feature_key, 2))
+                categories_used.append(feature_key)
 
         # Add platform-optimized hashtags for Instagram
-        if platform.lower() == "instagram":
-            hashtags.extend(self._get_random_from_category("instagram_optimized", 2))
-            hashtags.extend(self._get_random_from_category("engagement", 1))
-
-        # Add seasonal hashtags
-        season = self._get_current_season()
-        if season in self.CURATED_HASHTAGS:
-            hashtags.extend(self._get_random_from_category(season, 1))
+        if instagram:
+            draws.append(("instagram_optimized", 2))
+            draws.append(("engagement", 1))
 
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_hashtags = []
-        for tag in hashtags:
-            if tag.lower() not in seen:
-                seen.add(tag.lower())
-                unique_hashtags.append(tag)
-
-        # Limit to max_hashtags
-        final_hashtags = unique_hashtags[:max_hashtags]
+        # Deduped in first-use order (a category can come from several inputs)
+        return tuple(draws), tuple(dict.fromkeys(categories_used))
 
-        return {
-            "hashtags": final_hashtags,
-            "count": len(final_hashtags),
-            "categories_used": list(set(categories_used)),
-            "platform": platform,
-            "optimization_notes": self._get_optimization_notes(platform, len(final_hashtags))
-        }
-
-    def _get_random_from_category(self, category: str, count: int) -> List[str]:
-        """Get random hashtags from a category"""
-        import random
-        tags = self.CURATED_HASHTAGS.get(category, [])
+    def _get_random_from_category(
+        self,
+        category: str,
+        count: int,
+        exclude: AbstractSet[str] = frozenset()
+    ) -> Sequence[str]:
+        """Get random hashtags from a category, leaving out any in exclude"""
+        tags = self.CURATED_HASHTAGS.get(category, ())
+        if exclude and not exclude.isdisjoint(tags):
+            tags = [tag for tag in tags if tag not in exclude]
         if len(tags) <= count:
-            return tags.copy()
+            return tags  # Callers only read the result, so no copy is needed
         return random.sample(tags, count)
 
-    def _normalize_property_type(self, property_type: str) -> str:
+    # The normalizers are pure string -> category maps over a small set of
+    # inputs, so results are memoized rather than re-running the checks
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _normalize_property_type(property_type: str) -> str:
         """Normalize property type to match category keys"""
         pt = property_type.lower()
         if "detached" in pt and "semi" not in pt:
@@ -333,42 +443,22 @@ class HashtagService:
             return "mansion"
         return "general"
 
-    def _normalize_location(self, location: str) -> str:
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _normalize_location(cls, location: str) -> str:
         """Normalize location to match category keys"""
         loc = location.lower()
 
-        # Check for major cities/regions
-        location_mappings = {
-            "london": "london",
-            "manchester": "manchester",
-            "birmingham": "birmingham",
-            "bristol": "bristol",
-            "edinburgh": "edinburgh",
-            "leeds": "leeds",
-            "liverpool": "liverpool",
-            "cotswold": "cotswolds",
-            "surrey": "surrey",
-            "kent": "kent",
-            "sussex": "sussex",
-            "cornwall": "cornwall",
-            "devon": "devon",
-            "yorkshire": "yorkshire",
-            "scotland": "scotland",
-            "wales": "wales",
-            "glasgow": "scotland",
-            "cardiff": "wales",
-            "bath": "bristol",
-            "oxford": "cotswolds",
-            "cambridge": "general"
-        }
-
-        for key, value in location_mappings.items():
+        # First mapping (in order) whose key appears in the location wins
+        for key, value in cls.LOCATION_MAPPINGS.items():
             if key in loc:
                 return value
 
         return "general"
 
-    def _normalize_audience(self, audience: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _normalize_audience(audience: str) -> str:
         """Normalize audience to match category keys"""
         aud = audience.lower()
         if "first" in aud or "ftb" in aud:
@@ -383,7 +473,9 @@ class HashtagService:
             return "luxury"
         return "general"
 
-    def _normalize_feature(self, feature: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _normalize_feature(feature: str) -> str:
         """Normalize feature to match category keys"""
         feat = feature.lower()
         if "garden" in feat:
@@ -402,34 +494,14 @@ class HashtagService:
 
     def _get_current_season(self) -> str:
         """Get current season for seasonal hashtags"""
-        month = datetime.now().month
-        if month in [3, 4, 5]:
-            return "spring"
-        elif month in [6, 7, 8]:
-            return "summer"
-        elif month in [9, 10, 11]:
-            return "autumn"
-        else:
-            return "winter"
+        return self.SEASON_BY_MONTH[datetime.now().month]
 
     def _get_optimization_notes(self, platform: str, hashtag_count: int) -> str:
-        """Get platform-specific optimization notes"""
-        if platform.lower() == "instagram":
-            if hashtag_count < 10:
-                return "Consider adding more hashtags (Instagram allows up to 30, optimal is 11-15)"
-            elif hashtag_count <= 15:
-                return "Optimal hashtag count for Instagram engagement"
-            else:
-                return "Good hashtag coverage"
-        elif platform.lower() == "twitter":
-            if hashtag_count > 3:
-                return "Twitter performs better with 1-3 hashtags"
-            return "Good for Twitter"
-        elif platform.lower() == "facebook":
-            if hashtag_count > 5:
-                return "Facebook posts perform better with fewer hashtags (3-5)"
-            return "Good for Facebook"
-        return "Hashtags ready"
+        """Get platform-specific optimization notes (platform already lowercased)"""
+        for max_count, note in self.OPTIMIZATION_NOTES.get(platform, self.DEFAULT_OPTIMIZATION_NOTES):
+            if hashtag_count <= max_count:
+                return note
+        return self.DEFAULT_OPTIMIZATION_NOTES[0][1]
 
     async def get_trending_hashtags(self, location: str = "UK") -> List[str]:
         """
@@ -458,7 +530,9 @@ class HashtagService:
 
     async def close(self):
         """Close HTTP client"""
-        await self.http_client.aclose()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
 
 # Singleton instance
@@ -6,7 +6,8 @@ Higher scores = more impactful photos for hero page placement.
 """
 
 import logging
-from typing import List, Tuple, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Tuple, Dict, Optional
 from backend.schemas import BrochurePhoto
 
 logger = logging.getLogger(__name__)
@@ -97,6 +98,28 @@ class PhotoScorer:
         'heated': 10  # heated pool
     }
 
+    # Property character alignment rules: character -> (keywords, boost)
+    CHARACTER_KEYWORD_BOOSTS = {
+        'luxury': (('marble', 'chandelier', 'designer', 'pool'), 15),
+        'executive': (('modern', 'contemporary', 'open plan'), 10),
+        'period': (('traditional', 'period', 'original', 'fireplace'), 10)
+    }
+
+    # Property character alignment rules: character -> (room types, boost)
+    CHARACTER_ROOM_BOOSTS = {
+        'family': (frozenset({'kitchen', 'garden', 'family room'}), 10)
+    }
+
+    # Upper bound on memoized room-type lookups (room types come from client-supplied analysis)
+    ROOM_TYPE_CACHE_MAX = 1024
+
+    # Upper bound on memoized (analysis, character) -> score results
+    SCORE_CACHE_MAX = 4096
+
+    def __init__(self):
+        self._room_type_score_cache: Dict[str, float] = {}
+        self._score_cache: Dict[Tuple[str, str, Tuple[str, ...], str], float] = {}
+
     def score_photo(self, photo: BrochurePhoto, property_character: str = 'modern') -> float:
         """
         Score a single photo 0-100 based on impact.
@@ -110,27 +133,42 @@ class PhotoScorer:
         """
         score = 50.0  # Base score
 
-        if not photo.analysis:
+        analysis = photo.analysis
+        if not analysis:
             logger.warning(f"Photo {photo.id} has no analysis data, using base score")
             return score
 
+        # Lowercase caption/attributes once; every scoring step reuses them
+        attributes = analysis.get('attributes') or []
+        attrs_lower = tuple(a.lower() for a in attributes) if isinstance(attributes, list) else ()
+        caption = (analysis.get('caption') or '').lower()
+        room_type = (analysis.get('room_type') or 'other').lower()
+
+        # The score depends only on these inputs, so repeat scorings of the
+        # same analysis (autosaves, re-created sessions) are served from memory
+        cache_key = (room_type, caption, attrs_lower, property_character)
+        cached = self._score_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        combined_text = f"{caption} {' '.join(attrs_lower)}"
+
         # 1. Room Type Impact (40% weight)
-        room_type = (photo.analysis.get('room_type') or 'other').lower()
         room_score = self._get_room_type_score(room_type)
         score += (room_score - 50) * 0.4
 
         # 2. Keyword Boosts from caption/attributes (30% weight)
-        keyword_boost = self._calculate_keyword_boost(photo.analysis)
+        keyword_boost = self._calculate_keyword_boost(combined_text)
         score += keyword_boost * 0.3
 
         # 3. Visual Quality indicators (20% weight)
-        visual_boost = self._calculate_visual_quality(photo.analysis)
+        visual_boost = self._calculate_visual_quality(attrs_lower)
         score += visual_boost * 0.2
 
         # 4. Property Character Alignment (10% weight)
         character_boost = self._calculate_character_alignment(
             room_type,
-            photo.analysis,
+            combined_text,
             property_character
         )
         score += character_boost * 0.1
@@ -138,96 +176,100 @@ class PhotoScorer:
         # Clamp to 0-100
         score = max(0, min(100, score))
 
-        logger.debug(f"Photo {photo.id} ({room_type}): score={score:.1f}")
+        if len(self._score_cache) < self.SCORE_CACHE_MAX:
+            self._score_cache[cache_key] = score
+
+        logger.debug("Photo %s (%s): score=%.1f", photo.id, room_type, score)
         return score
 
+    def score_photos(
+        self,
+        photos: List[BrochurePhoto],
+        property_character: str = 'modern'
+    ) -> List[float]:
+        """
+        Score a batch of photos 0-100 in a single pass.
+
+        Args:
+            photos: Photos with analysis data
+            property_character: luxury/executive/family/compact/period/modern
+
+        Returns:
+            Scores in the same order as photos
+        """
+        score = self.score_photo
+        return [score(photo, property_character) for photo in photos]
+
     def _get_room_type_score(self, room_type: str) -> float:
-        """Get base score for room type."""
+        """Get base score for room type (partial-match results are memoized)."""
         # Try exact match first
         if room_type in self.ROOM_TYPE_WEIGHTS:
             return self.ROOM_TYPE_WEIGHTS[room_type]
 
+        cached = self._room_type_score_cache.get(room_type)
+        if cached is not None:
+            return cached
+
         # Try partial matches
+        score = self.ROOM_TYPE_WEIGHTS['other']
         for key, value in self.ROOM_TYPE_WEIGHTS.items():
             if key in room_type or room_type in key:
-                return value
+                score = value
+                break
 
-        return self.ROOM_TYPE_WEIGHTS['other']
+        if len(self._room_type_score_cache) < self.ROOM_TYPE_CACHE_MAX:
+            self._room_type_score_cache[room_type] = score
+        return score
 
-    def _calculate_keyword_boost(self, analysis: Dict[str, Any]) -> float:
-        """Calculate boost from keywords in caption/attributes."""
+    def _calculate_keyword_boost(self, combined_text: str) -> float:
+        """Calculate boost from keywords in lowercased caption + attributes text."""
         boost = 0.0
-
-        # Check caption
-        caption = (analysis.get('caption') or '').lower()
-
-        # Check attributes
-        attributes = analysis.get('attributes') or []
-        if isinstance(attributes, list):
-            attributes_text = ' '.join(attributes).lower()
-        else:
-            attributes_text = ''
-
-        combined_text = f"{caption} {attributes_text}"
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
         for keyword, boost_value in self.BOOST_KEYWORDS.items():
             if keyword in combined_text:
                 boost += boost_value
-                logger.debug(f"  Keyword '{keyword}' found: +{boost_value}")
+                if debug_enabled:
+                    logger.debug("  Keyword '%s' found: +%s", keyword, boost_value)
 
         return min(boost, 50)  # Cap total keyword boost at 50
 
-    def _calculate_visual_quality(self, analysis: Dict[str, Any]) -> float:
-        """Estimate visual quality from analysis data."""
+    def _calculate_visual_quality(self, attrs_lower: Tuple[str, ...]) -> float:
+        """Estimate visual quality from lowercased analysis attributes."""
         boost = 0.0
 
-        # Look for quality indicators in attributes
-        attributes = analysis.get('attributes') or []
-        if isinstance(attributes, list):
-            attrs_lower = [a.lower() for a in attributes]
-
-            # Positive quality indicators
-            if 'well lit' in attrs_lower or 'bright' in attrs_lower:
-                boost += 10
-            if 'clean' in attrs_lower or 'tidy' in attrs_lower:
-                boost += 5
-            if 'professional' in attrs_lower:
-                boost += 10
+        # Positive quality indicators
+        if 'well lit' in attrs_lower or 'bright' in attrs_lower:
+            boost += 10
+        if 'clean' in attrs_lower or 'tidy' in attrs_lower:
+            boost += 5
+        if 'professional' in attrs_lower:
+            boost += 10
 
         return boost
 
     def _calculate_character_alignment(
         self,
         room_type: str,
-        analysis: Dict[str, Any],
+        combined: str,
         character: str
     ) -> float:
         """Boost score if photo aligns with property character."""
         boost = 0.0
 
-        caption = (analysis.get('caption') or '').lower()
-        attributes_text = ' '.join(analysis.get('attributes') or []).lower()
-        combined = f"{caption} {attributes_text}"
-
-        # Luxury properties
-        if character == 'luxury':
-            if any(kw in combined for kw in ['marble', 'chandelier', 'designer', 'pool']):
-                boost += 15
+        # Luxury / executive / period properties: keywords in caption + attributes
+        keyword_rule = self.CHARACTER_KEYWORD_BOOSTS.get(character)
+        if keyword_rule:
+            keywords, value = keyword_rule
+            if any(kw in combined for kw in keywords):
+                boost += value
 
-        # Executive properties
-        elif character == 'executive':
-            if any(kw in combined for kw in ['modern', 'contemporary', 'open plan']):
-                boost += 10
-
-        # Family properties
-        elif character == 'family':
-            if room_type in ['kitchen', 'garden', 'family room']:
-                boost += 10
-
-        # Period properties
-        elif character == 'period':
-            if any(kw in combined for kw in ['traditional', 'period', 'original', 'fireplace']):
-                boost += 10
+        # Family properties: room types
+        room_rule = self.CHARACTER_ROOM_BOOSTS.get(character)
+        if room_rule:
+            room_types, value = room_rule
+            if room_type in room_types:
+                boost += value
 
         return boost
 
@@ -248,11 +290,7 @@ class PhotoScorer:
         Returns:
             List of (photo, score) tuples sorted by score descending
         """
-        scored_photos = []
-
-        for photo in photos:
-            score = self.score_photo(photo, property_character)
-            scored_photos.append((photo, score))
+        scored_photos = list(zip(photos, self.score_photos(photos, property_character)))
 
         # Sort by score descending
         scored_photos.sort(key=lambda x: x[1], reverse=True)
@@ -285,12 +323,7 @@ class PhotoScorer:
         return [photo for photo, score in ranked]
 
 
-# Singleton instance
-_scorer_instance = None
-
+@lru_cache(maxsize=1)
 def get_photo_scorer() -> PhotoScorer:
     """Get singleton photo scorer instance."""
-    global _scorer_instance
-    if _scorer_instance is None:
-        _scorer_instance = PhotoScorer()
-    return _scorer_instance
+    return PhotoScorer()
@@ -1,11 +1,12 @@
 """
 Computer vision adapter for property image analysis.
 """
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from backend.schemas import ImageAnalysisResponse, ImageAttribute
 from providers import VisionClient
 from PIL import Image
 from io import BytesIO
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,6 +49,12 @@ class VisionAdapter:
             f"types={','.join(self.allowed_types)}"
         )
     
+    async def close(self):
+        """Close the provider's HTTP client, if it holds one."""
+        close = getattr(self.vision_client, "close", None)
+        if close is not None:
+            await close()
+
     async def analyze_image(
         self,
         image_data: bytes,
@@ -89,6 +96,57 @@ class VisionAdapter:
             logger.error(f"Vision analysis failed for {filename}: {str(e)}")
             raise
     
+    async def analyze_images(
+        self,
+        images: List[Tuple[bytes, str]],
+        max_concurrency: int = 8
+    ) -> List[ImageAnalysisResponse]:
+        """
+        Analyze several property images.
+
+        Every image is validated before any analysis starts. Providers that
+        support batching (analyze_images) get all images in one call; others
+        are called concurrently per image, at most max_concurrency at a time.
+
+        Args:
+            images: List of (image_bytes, filename) tuples
+            max_concurrency: Per-image calls in flight for non-batching providers
+
+        Returns:
+            ImageAnalysisResponse per image, in input order
+
+        Raises:
+            ValidationError: If any image fails validation (message names the file)
+        """
+        corrected = []
+        for image_data, filename in images:
+            try:
+                self._validate_file_type(filename)
+                self._validate_file_size(image_data)
+            except ValidationError as e:
+                raise ValidationError(f"{filename}: {str(e)}")
+            corrected.append((self._correct_exif_orientation(image_data), filename))
+
+        try:
+            if hasattr(self.vision_client, "analyze_images"):
+                analyses = await self.vision_client.analyze_images(corrected)
+            else:
+                semaphore = asyncio.Semaphore(max_concurrency)
+
+                async def analyze_one(data: bytes, filename: str) -> Dict:
+                    async with semaphore:
+                        return await self.vision_client.analyze_image(data, filename)
+
+                analyses = await asyncio.gather(
+                    *(analyze_one(data, filename) for data, filename in corrected)
+                )
+
+            return [self._convert_to_response(analysis) for analysis in analyses]
+
+        except Exception as e:
+            logger.error(f"Vision analysis failed for {len(images)} images: {str(e)}")
+            raise
+
     def _validate_file_type(self, filename: str) -> None:
         """
         Validate file extension.
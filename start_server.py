@@ -1,23 +1,48 @@
 #!/usr/bin/env python -u
 """Simple startup script for Railway deployment."""
-# Immediate print before any imports
-print("SCRIPT STARTING", flush=True)
+# Launched with `python -u` (railway.toml / Dockerfile), so stdout is already
+# unbuffered and prints need no explicit flushing
 import os
 import sys
-sys.stdout.reconfigure(line_buffering=True)
 
-print("=" * 50, flush=True)
-print("START_SERVER.PY RUNNING", flush=True)
-print(f"Python version: {sys.version}", flush=True)
-print(f"Working directory: {os.getcwd()}", flush=True)
-print(f"PORT env var: {os.environ.get('PORT', 'not set')}", flush=True)
-print("=" * 50, flush=True)
+# Boot diagnostics for debugging deploys (set BOOT_DEBUG=1)
+if os.environ.get("BOOT_DEBUG"):
+    print(
+        "\n".join([
+            "=" * 50,
+            "START_SERVER.PY RUNNING",
+            f"Python version: {sys.version}",
+            f"Working directory: {os.getcwd()}",
+            f"PORT env var: {os.environ.get('PORT', 'not set')}",
+            "=" * 50,
+        ])
+    )
 
 # Get port from environment
 port = int(os.environ.get("PORT", 8000))
 host = "0.0.0.0"
 
-print(f"Starting uvicorn on {host}:{port}", flush=True)
+# Optional cap on concurrent connections (bounds memory under large upload bursts)
+limit_concurrency = os.environ.get("UVICORN_LIMIT_CONCURRENCY")
+
+# Worker processes. Defaults to 1: every worker runs its own post scheduler
+# and in-memory caches, so raise WEB_CONCURRENCY only where that is acceptable
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
 
 import uvicorn
-uvicorn.run("backend.main:app", host=host, port=port)
+
+# Guarded because worker processes re-import this script when workers > 1
+if __name__ == "__main__":
+    print(f"Starting uvicorn on {host}:{port} with {workers} worker(s)")
+
+    # uvloop and httptools ship with uvicorn[standard]; name them explicitly so the
+    # fast loop/parser are used rather than silently falling back to asyncio/h11
+    uvicorn.run(
+        "backend.main:app",
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+        workers=workers,
+    )